@@ -0,0 +1,89 @@
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT / "src") not in sys.path:
+    sys.path.append(str(ROOT / "src"))
+
+from crew.backends.timeseries import HIGHER_IS_WORSE, score_frame
+
+METRICS = ("error_rate", "latency_p95_ms", "rps", "db.cpu", "db.connections")
+LEVELS = (0.5, 180.0, 1200.0, 40.0, 120.0)
+
+
+def synthetic_fleet(
+    series: int, points: int, anomalies: int, recent: int, seed: int = 0
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    kinds = np.arange(series) % len(METRICS)
+    level = np.asarray(LEVELS)[kinds] * rng.uniform(0.5, 2.0, series)
+    noise = level * rng.uniform(0.02, 0.08, series)
+    daily = np.sin(np.linspace(0, 2 * np.pi * points / 288, points))
+    values = level[:, None] * (1 + 0.1 * daily) + noise[:, None] * rng.standard_normal(
+        (series, points)
+    )
+    injected = rng.choice(series, anomalies, replace=False)
+    onsets = points - rng.integers(recent // 2, recent * 2, anomalies)
+    jumps = noise[injected] * rng.uniform(6, 12, anomalies)
+    for row, onset, jump in zip(injected, onsets, jumps):
+        sign = -1.0 if METRICS[kinds[row]] == "rps" else 1.0
+        values[row, onset:] += sign * jump
+    worse_up = np.asarray(
+        [any(word in METRICS[kind] for word in HIGHER_IS_WORSE) for kind in kinds]
+    )
+    return values.astype(np.float32), worse_up, injected
+
+
+def run_fleet(args: argparse.Namespace, series: int) -> dict:
+    points, recent = args.points, args.recent
+    anomalies = max(1, series // 100)
+    values, worse_up, injected = synthetic_fleet(series, points, anomalies, recent)
+    timings = []
+    for _ in range(args.repeats):
+        started = time.perf_counter()
+        result = score_frame(values, recent, worse_up, args.baseline)
+        timings.append(time.perf_counter() - started)
+    flagged = set(np.flatnonzero(result["score"] >= args.threshold).tolist())
+    top = set(np.argsort(-result["score"])[:anomalies].tolist())
+    truth = set(injected.tolist())
+    return {
+        "series": series,
+        "points": points,
+        "cells": series * points,
+        "score_ms": round(min(timings) * 1000, 2),
+        "injected": anomalies,
+        "flagged": len(flagged),
+        "recall": round(len(flagged & truth) / anomalies, 3),
+        "precision": round(len(flagged & truth) / len(flagged), 3) if flagged else 1.0,
+        "top_k_recall": round(len(top & truth) / anomalies, 3),
+    }
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark vectorized metric anomaly scoring.")
+    parser.add_argument("--series", nargs="*", type=int, default=[1000, 5000, 20000, 50000])
+    parser.add_argument("--points", type=int, default=360, help="Samples per series")
+    parser.add_argument("--recent", type=int, default=12, help="Points in the recent window")
+    parser.add_argument("--baseline", type=int, default=48, help="Points before the window")
+    parser.add_argument("--threshold", type=float, default=4.0)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    results = [run_fleet(args, size) for size in args.series]
+    report = json.dumps({"points": args.points, "results": results}, indent=2)
+    if args.output:
+        Path(args.output).write_text(report + "\n", encoding="utf-8")
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
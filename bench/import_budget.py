@@ -0,0 +1,84 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Cumulative import time budgets (ms) for the entry points, measured with -X importtime.
+BUDGETS_MS = {
+    "run_demo": 150,
+    "pdf_summarizer": 200,
+    "pdf_text": 100,
+}
+
+HEAVY_MODULES = ("crewai", "litellm", "chromadb", "pypdf", "streamlit")
+
+# Streamlit entry points load streamlit itself, but must defer the crew stack to job workers.
+UI_MODULES = ("ui", "pdf_ui")
+UI_HEAVY_MODULES = ("crewai", "litellm")
+
+
+def measure(module: str) -> tuple[float, set[str]]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join([str(ROOT / "src"), str(ROOT / "src2")])
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    cumulative_us = 0
+    loaded: set[str] = set()
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if not cumulative.isdigit():
+            continue
+        loaded.add(name.split(".")[0])
+        if name == module:
+            cumulative_us = int(cumulative)
+    return cumulative_us / 1000, loaded
+
+
+def check_budget(module: str) -> tuple[dict, list[str]]:
+    budget = float(os.getenv(f"IMPORT_BUDGET_{module.upper()}_MS", BUDGETS_MS[module]))
+    elapsed, loaded = measure(module)
+    heavy = sorted(loaded.intersection(HEAVY_MODULES))
+    failures = []
+    if elapsed > budget:
+        failures.append(f"{module} imported in {elapsed:.1f}ms (budget {budget:.0f}ms)")
+    if heavy:
+        failures.append(f"{module} eagerly imports {', '.join(heavy)}")
+    return {"ms": round(elapsed, 2), "budget_ms": budget, "heavy": heavy}, failures
+
+
+def check_ui(module: str) -> tuple[dict, list[str]]:
+    elapsed, loaded = measure(module)
+    heavy = sorted(loaded.intersection(UI_HEAVY_MODULES))
+    failures = [f"{module} eagerly imports {', '.join(heavy)}"] if heavy else []
+    return {"ms": round(elapsed, 2), "heavy": heavy}, failures
+
+
+def main() -> None:
+    report = {}
+    failures = []
+    for module in BUDGETS_MS:
+        report[module], failed = check_budget(module)
+        failures += failed
+    if importlib.util.find_spec("streamlit") is not None:
+        for module in UI_MODULES:
+            report[module], failed = check_ui(module)
+            failures += failed
+
+    print(json.dumps(report, indent=2))
+    if failures:
+        raise SystemExit("\n".join(failures))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+import argparse
+import io
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+for path in (ROOT / "src", ROOT / "src2"):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
+
+INCIDENT = "Payments API returns 500s after a deploy; customer complaints increasing."
+
+CREW_MODES = {
+    "sequential": {"SAFE_MODE": "true"},
+    "routed": {},
+    "hierarchical": {"LLM_MANAGER": "true"},
+    "survival": {"SURVIVAL_MODE": "true"},
+    "parallel": {"PARALLEL_MODE": "true"},
+    "adaptive": {"ADAPTIVE_MODE": "true"},
+}
+
+BENCH_ENV = {
+    "MEMORY_ENABLED": "false",
+    "LLM_CACHE": "false",
+    "SAFE_MODE": "false",
+    "SURVIVAL_MODE": "false",
+    "PARALLEL_MODE": "false",
+    "ADAPTIVE_MODE": "false",
+    "LLM_MANAGER": "false",
+    "INCIDENT_INDEX": "false",
+    "ENV_FILE": "",
+}
+
+SENTENCES = (
+    "The service handles payment authorization for the checkout flow.",
+    "Latency budgets are enforced per region with automatic failover.",
+    "Database replicas lag during nightly batch jobs and recover by morning.",
+    "Incident reviews found retry storms amplified the original fault.",
+    "Operators rotate credentials quarterly and audit access monthly.",
+)
+
+
+def synthetic_document(pages: int, chars_per_page: int = 2500) -> list[str]:
+    document = []
+    for page in range(pages):
+        sentences = []
+        size = 0
+        index = page
+        while size < chars_per_page:
+            sentence = f"Section {page + 1}: {SENTENCES[index % len(SENTENCES)]}"
+            sentences.append(sentence)
+            size += len(sentence) + 1
+            index += 1
+        document.append(" ".join(sentences))
+    return document
+
+
+def summarize_calls(calls: list[dict], started: float) -> dict:
+    tasks: dict[str, dict] = {}
+    for call in calls:
+        entry = tasks.setdefault(
+            call["role"],
+            {"calls": 0, "start": call["started"], "end": call["started"], "llm_seconds": 0.0},
+        )
+        entry["calls"] += 1
+        entry["start"] = min(entry["start"], call["started"])
+        entry["end"] = max(entry["end"], call["started"] + call["seconds"])
+        entry["llm_seconds"] += call["seconds"]
+    return {
+        role: {
+            "calls": entry["calls"],
+            "offset_seconds": round(entry["start"] - started, 4),
+            "span_seconds": round(entry["end"] - entry["start"], 4),
+            "llm_seconds": round(entry["llm_seconds"], 4),
+        }
+        for role, entry in tasks.items()
+    }
+
+
+def run_scenario(name: str, args: argparse.Namespace) -> dict:
+    from fake_llm import FakeLLM
+
+    from crew.settings import override_settings
+
+    override_settings(**BENCH_ENV)
+    responses = json.loads(Path(args.responses).read_text()) if args.responses else None
+    llm = FakeLLM(
+        latency=args.latency,
+        completion_tokens=args.completion_tokens,
+        responses=responses,
+    )
+
+    kind, _, variant = name.partition(":")
+    if kind == "crew":
+        override_settings(**CREW_MODES[variant])
+        from crew.agents import build_agents
+        from crew.crew import build_crew
+
+        agents = build_agents(llm=llm, synthesis_llm=llm)
+        crew = build_crew(INCIDENT, agents=agents, manager_llm=llm)
+    elif kind == "pdf":
+        from pdf_summarizer import build_pdf_crew
+
+        crew = build_pdf_crew(synthetic_document(int(variant)), llm=llm, synthesis_llm=llm)
+    else:
+        raise SystemExit(f"Unknown scenario: {name}")
+
+    started = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        crew.kickoff()
+    wall = time.perf_counter() - started
+
+    return {
+        "scenario": name,
+        "wall_seconds": round(wall, 4),
+        "llm_calls": len(llm.calls),
+        "prompt_tokens": sum(call["prompt_tokens"] for call in llm.calls),
+        "completion_tokens": sum(call["completion_tokens"] for call in llm.calls),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "tasks": summarize_calls(llm.calls, started),
+    }
+
+
+def scenario_names(args: argparse.Namespace) -> list[str]:
+    names = [f"crew:{mode}" for mode in args.modes]
+    names += [f"pdf:{pages}" for pages in args.pdf_pages]
+    return names
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark crew orchestration with a fake LLM.")
+    parser.add_argument("--modes", nargs="*", default=list(CREW_MODES), choices=list(CREW_MODES))
+    parser.add_argument("--pdf-pages", nargs="*", type=int, default=[10, 50, 200])
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per fake LLM call")
+    parser.add_argument("--completion-tokens", type=int, default=120)
+    parser.add_argument("--responses", help="JSON list of canned responses to replay")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    parser.add_argument("--scenario", help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.scenario:
+        result = run_scenario(args.scenario, args)
+        Path(args.result_file).write_text(json.dumps(result), encoding="utf-8")
+        return
+
+    passthrough = ["--latency", str(args.latency), "--completion-tokens", str(args.completion_tokens)]
+    if args.responses:
+        passthrough += ["--responses", args.responses]
+
+    results = []
+    for name in scenario_names(args):
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
+            result_path = Path(tmp.name)
+        try:
+            subprocess.run(
+                [sys.executable, __file__, "--scenario", name, "--result-file", str(result_path)]
+                + passthrough,
+                check=True,
+                stdout=subprocess.DEVNULL,
+            )
+            results.append(json.loads(result_path.read_text(encoding="utf-8")))
+        finally:
+            result_path.unlink(missing_ok=True)
+
+    report = json.dumps({"latency": args.latency, "results": results}, indent=2)
+    if args.output:
+        Path(args.output).write_text(report + "\n", encoding="utf-8")
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
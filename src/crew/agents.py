@@ -1,38 +1,36 @@
-import os
-
-from crewai import Agent, LLM
+from crewai import LLM, Agent
 
+from .llm import build_llm
 from .tools import build_tools
 
+AGENT_MODELS = {
+    "incident_commander": ("synthesis", "strong"),
+    "sre_triage": ("specialist", "fast"),
+    "app_engineer": ("specialist", "fast"),
+    "database_specialist": ("specialist", "fast"),
+    "security_analyst": ("specialist", "fast"),
+    "comms_lead": ("synthesis", "strong"),
+}
 
-def build_llm() -> LLM | None:
-    model = os.getenv("LLM_MODEL")
-    if model:
-        if "gemini" in model and not (
-            os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY")
-        ):
-            return None
-        if "gpt" in model and not os.getenv("OPENAI_API_KEY"):
-            return None
-        try:
-            return LLM(model=model)
-        except ImportError:
-            return None
-
-    if os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY"):
-        return LLM(model="gemini/gemini-1.5-flash")
 
-    if os.getenv("OPENAI_API_KEY"):
-        return LLM(model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"))
+def build_agent_llms() -> dict[str, LLM | None]:
+    built = {spec: build_llm(*spec) for spec in set(AGENT_MODELS.values())}
+    return {name: built[spec] for name, spec in AGENT_MODELS.items()}
 
-    return None
 
-
-def build_agents(tools: dict | None = None) -> dict[str, Agent]:
+def build_agents(
+    tools: dict | None = None,
+    llm: LLM | None = None,
+    synthesis_llm: LLM | None = None,
+    llms: dict[str, LLM | None] | None = None,
+) -> dict[str, Agent]:
     tools = tools or build_tools()
-    llm = build_llm()
-    max_rpm_env = os.getenv("AGENT_MAX_RPM")
-    max_rpm = int(max_rpm_env) if max_rpm_env else None
+    if llms is None:
+        llms = {} if llm and synthesis_llm else build_agent_llms()
+    overrides = {"specialist": llm, "synthesis": synthesis_llm}
+    llms = {
+        name: overrides[lane] or llms.get(name) for name, (lane, _) in AGENT_MODELS.items()
+    }
 
     def pick(*names: str):
         return [tool for tool in (tools.get(name) for name in names) if tool]
@@ -44,60 +42,54 @@ def build_agents(tools: dict | None = None) -> dict[str, Agent]:
             "Veteran incident lead with cross-team authority and a focus on "
             "rapid stabilization."
         ),
-        llm=llm,
+        llm=llms["incident_commander"],
         tools=pick("incident_tracker", "status_page"),
         allow_delegation=True,
-        max_rpm=max_rpm,
     )
 
     sre_triage = Agent(
         role="SRE Triage",
         goal="Analyze metrics/logs and isolate the likely root cause.",
         backstory="On-call SRE specializing in observability and rapid diagnosis.",
-        llm=llm,
+        llm=llms["sre_triage"],
         tools=pick("metrics", "logs"),
         allow_delegation=False,
-        max_rpm=max_rpm,
     )
 
     app_engineer = Agent(
         role="App Engineer",
         goal="Inspect recent deploys/config changes and application behavior.",
         backstory="Senior backend engineer familiar with the release pipeline.",
-        llm=llm,
+        llm=llms["app_engineer"],
         tools=pick("deploy_history", "config_repo"),
         allow_delegation=False,
-        max_rpm=max_rpm,
     )
 
     database_specialist = Agent(
         role="Database Specialist",
         goal="Diagnose database performance, query issues, and scaling risks.",
         backstory="DBA experienced with performance tuning and indexing.",
-        llm=llm,
+        llm=llms["database_specialist"],
         tools=pick("db_metrics", "query_analyzer"),
         allow_delegation=False,
-        max_rpm=max_rpm,
     )
 
     security_analyst = Agent(
         role="Security Analyst",
         goal="Assess alerts, containment actions, and security risk.",
         backstory="SOC analyst focused on rapid threat assessment and triage.",
-        llm=llm,
+        llm=llms["security_analyst"],
         tools=pick("siem", "threat_intel"),
         allow_delegation=False,
-        max_rpm=max_rpm,
     )
 
     comms_lead = Agent(
         role="Comms Lead",
         goal="Draft stakeholder updates and post-incident summary.",
         backstory="Technical communicator for incident updates and reporting.",
-        llm=llm,
+        llm=llms["comms_lead"],
         tools=pick("status_page", "incident_tracker"),
         allow_delegation=False,
-        max_rpm=max_rpm,
     )
 
     return {
@@ -0,0 +1,3 @@
+from .http import backend_for, call_backend, run_backend
+
+__all__ = ["backend_for", "call_backend", "run_backend"]
@@ -0,0 +1,165 @@
+import asyncio
+import json
+import math
+import os
+import threading
+import warnings
+
+from ..settings import get_settings
+
+# tool name -> (backend, method, path, parameter)
+TOOL_ROUTES = {
+    "metrics": ("metrics", "GET", "/metrics", "query"),
+    "logs": ("logs", "GET", "/logs", "query"),
+    "deploy_history": ("deploys", "GET", "/deploys", "service"),
+    "config_repo": ("deploys", "GET", "/config-diffs", "service"),
+    "db_metrics": ("database", "GET", "/db/metrics", "db"),
+    "query_analyzer": ("database", "GET", "/db/slow-queries", "db"),
+    "siem": ("security", "GET", "/alerts", "query"),
+    "threat_intel": ("security", "GET", "/intel", "query"),
+    "incident_tracker": ("tracker", "POST", "/incidents/updates", "update"),
+    "status_page": ("statuspage", "POST", "/status/updates", "update"),
+}
+
+
+class BackendLoop:
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(
+            target=self.loop.run_forever, name="tool-backends", daemon=True
+        )
+        self.thread.start()
+        self._client = None
+
+    def run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    async def run_async(self, coro):
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self.loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, self.loop))
+
+    def client(self):
+        if self._client is None:
+            import httpx
+
+            max_connections = get_settings().tool_http_max_connections
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_connections,
+                ),
+            )
+        return self._client
+
+
+class Backend:
+    def __init__(self, name: str, base_url: str, timeout: float, loop: BackendLoop):
+        self.name = name
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.loop = loop
+        self.stats = {"requests": 0, "coalesced": 0, "errors": 0}
+        self._inflight: dict[tuple, asyncio.Future] = {}
+
+    async def _send(self, method: str, path: str, params: dict) -> dict:
+        self.stats["requests"] += 1
+        client = self.loop.client()
+        url = f"{self.base_url}{path}"
+        if method == "GET":
+            response = await client.get(url, params=params, timeout=self.timeout)
+        else:
+            response = await client.request(method, url, json=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    async def request(self, method: str, path: str, params: dict) -> dict:
+        if method != "GET":
+            return await self._send(method, path, params)
+        key = (path, tuple(sorted(params.items())))
+        pending = self._inflight.get(key)
+        if pending is None:
+            pending = asyncio.ensure_future(self._send(method, path, params))
+            self._inflight[key] = pending
+            pending.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.stats["coalesced"] += 1
+        return await asyncio.shield(pending)
+
+
+_loop: BackendLoop | None = None
+_backends: dict[str, Backend] = {}
+_lock = threading.Lock()
+
+
+def backend_loop() -> BackendLoop:
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = BackendLoop()
+        return _loop
+
+
+def backend_timeout(prefix: str, default: float = 5.0) -> float:
+    raw = os.getenv(f"{prefix}_TIMEOUT", "").strip()
+    if not raw:
+        return default
+    try:
+        timeout = float(raw)
+    except ValueError:
+        timeout = math.nan
+    if not math.isfinite(timeout) or timeout <= 0:
+        warnings.warn(
+            f"{prefix}_TIMEOUT={raw!r} is not a positive number, using {default:g}s",
+            RuntimeWarning,
+        )
+        return default
+    return timeout
+
+
+def backend_for(name: str) -> Backend | None:
+    prefix = f"TOOL_BACKEND_{name.upper()}"
+    base_url = os.getenv(f"{prefix}_URL")
+    if not base_url:
+        return None
+    loop = backend_loop()
+    with _lock:
+        backend = _backends.get(name)
+        if backend is None or backend.base_url != base_url.rstrip("/"):
+            backend = Backend(name, base_url, backend_timeout(prefix), loop)
+            _backends[name] = backend
+        return backend
+
+
+def format_payload(label: str, payload) -> str:
+    if isinstance(payload, dict):
+        body = "; ".join(
+            f"{key}={json.dumps(value) if isinstance(value, (dict, list)) else value}"
+            for key, value in payload.items()
+        )
+        return f"{label}: {body}"
+    if isinstance(payload, list):
+        return f"{label}:\n" + "\n".join(format_payload("-", item) for item in payload)
+    return f"{label}: {payload}"
+
+
+async def call_backend(tool_name: str, value: str, fallback: str) -> str:
+    backend_name, method, path, parameter = TOOL_ROUTES[tool_name]
+    backend = backend_for(backend_name)
+    if backend is None:
+        return fallback
+    try:
+        request = backend.request(method, path, {parameter: value})
+        payload = await backend.loop.run_async(request)
+    except Exception as exc:
+        backend.stats["errors"] += 1
+        return f"{tool_name} backend unavailable ({type(exc).__name__}); {fallback}"
+    return format_payload(tool_name, payload)
+
+
+def run_backend(coro):
+    return backend_loop().run(coro)
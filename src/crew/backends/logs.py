@@ -0,0 +1,394 @@
+import json
+import mmap
+import re
+import threading
+import zlib
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from ..settings import ROOT, get_settings
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+_TIMESTAMP = re.compile(rb"^\[?(\d{4}-\d{2}-\d{2})[T ](\d{2}:\d{2}:\d{2})", re.MULTILINE)
+_PREFIX = re.compile(rb"^\[?\d{4}-\d{2}-\d{2}[T ][\d:]{8}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?\]?")
+_TOKEN = re.compile(rb"[a-z][a-z0-9_]{2,}")
+_LAST = re.compile(r"last\s+(\d+)\s*(m|min|mins|minutes?|h|hrs?|hours?)\b", re.IGNORECASE)
+_QUERY_TIME = re.compile(r"(\d{4}-\d{2}-\d{2})[T ](\d{2}:\d{2})(?::(\d{2}))?")
+_ERROR = re.compile(
+    rb"\b(?:error|fatal|critical|exception|panic|fail(?:ed|ure)?|timeout|timed out|refused)\b",
+    re.IGNORECASE,
+)
+_EXCEPTION = re.compile(rb"\b[A-Za-z_][\w.$]*(?:Exception|Error)\b")
+_VOLATILE = (
+    (re.compile(r"\b[0-9a-f]{8}(?:-[0-9a-f]{4}){3}-[0-9a-f]{12}\b", re.I), "<uuid>"),
+    (re.compile(r"\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b"), "<ip>"),
+    (re.compile(r"\b0x[0-9a-f]+\b|\b[0-9a-f]{12,}\b", re.I), "<hex>"),
+    (re.compile(r"\"[^\"]*\"|'[^']*'"), "<str>"),
+    (re.compile(r"\d+(?:\.\d+)?"), "<n>"),
+)
+
+# Longest multi-line event (e.g. a stack trace) stitched across block boundaries.
+MAX_EVENT_BYTES = 1 << 20
+
+QUERY_STOPWORDS = frozenset(
+    "the and for with from into after before since around last minute minutes hour hours "
+    "min mins log logs error errors recent incident context show find fetch check trace "
+    "traces related".split()
+)
+
+
+def line_time(text: bytes) -> str | None:
+    match = _TIMESTAMP.match(text)
+    return f"{match[1].decode()}T{match[2].decode()}" if match else None
+
+
+def to_epoch(stamp: str) -> int:
+    return int(datetime.fromisoformat(stamp).replace(tzinfo=timezone.utc).timestamp())
+
+
+def block_time(stamp: tuple[bytes, bytes], fallback: int) -> int:
+    try:
+        return to_epoch(f"{stamp[0].decode()}T{stamp[1].decode()}")
+    except ValueError:
+        return fallback
+
+
+def last_stamp(block: bytes, lines: int = 64) -> re.Match | None:
+    end = len(block) - 1
+    for _ in range(lines):
+        if end <= 0:
+            return None
+        start = block.rfind(b"\n", 0, end) + 1
+        match = _TIMESTAMP.match(block, start)
+        if match:
+            return match
+        end = start - 1
+    return None
+
+
+def to_stamp(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+
+
+def signature(header: bytes, body: list[bytes]) -> str:
+    text = _PREFIX.sub(b"", header, count=1).decode("utf-8", "replace").strip(" ]-|:")
+    if not _EXCEPTION.search(header):
+        cause = next((m for m in map(_EXCEPTION.search, body) if m), None)
+        if cause:
+            text += f" [{cause[0].decode('utf-8', 'replace')}]"
+    for pattern, placeholder in _VOLATILE:
+        text = pattern.sub(placeholder, text)
+    return " ".join(text.split())[:160]
+
+
+class Bloom:
+    def __init__(self, bits: int, hashes: int = 3):
+        self.bits = bits
+        self.hashes = hashes
+
+    def positions(self, token: bytes) -> list[int]:
+        first = zlib.crc32(token)
+        second = zlib.adler32(token) | 1
+        return [(first + i * second) % self.bits for i in range(self.hashes)]
+
+    def encode(self, tokens: set[bytes]) -> np.ndarray:
+        bits = np.zeros(self.bits, dtype=bool)
+        bits[[position for token in tokens for position in self.positions(token)]] = True
+        return np.packbits(bits, bitorder="little")
+
+    def matches(self, rows: np.ndarray, token: bytes) -> np.ndarray:
+        hit = np.ones(len(rows), dtype=bool)
+        for position in self.positions(token):
+            hit &= (rows[:, position >> 3] & (1 << (position & 7))) != 0
+        return hit
+
+
+class LogFileIndex:
+    def __init__(self, path: Path, directory: Path, block_bytes: int, bloom: Bloom):
+        self.path = path
+        self.bloom = bloom
+        self.block_bytes = block_bytes
+        stat = path.stat()
+        key = f"{stat.st_dev}-{stat.st_ino}"
+        self.meta_path = directory / f"{key}.json"
+        self.blocks_path = directory / f"{key}.blocks"
+        self.bloom_path = directory / f"{key}.bloom"
+        self.lock_path = directory / f"{key}.lock"
+        self.meta = {"indexed": 0, "blocks": 0, "head": "", "head_bytes": 0}
+        if self.meta_path.exists():
+            self.meta = json.loads(self.meta_path.read_text(encoding="utf-8"))
+        self.blocks = np.zeros((0, 4), dtype=np.int64)
+        self.blooms = np.zeros((0, bloom.bits // 8), dtype=np.uint8)
+
+    def _file_lock(self):
+        handle = open(self.lock_path, "a")
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        return handle
+
+    def _head(self, data, length: int) -> str:
+        return f"{zlib.crc32(data[:length]):08x}"
+
+    def _load(self) -> None:
+        count = self.meta["blocks"]
+        if count == 0:
+            self.blocks = np.zeros((0, 4), dtype=np.int64)
+            self.blooms = np.zeros((0, self.bloom.bits // 8), dtype=np.uint8)
+            return
+        self.blocks = np.memmap(self.blocks_path, dtype=np.int64, mode="r", shape=(count, 4))
+        self.blooms = np.memmap(
+            self.bloom_path, dtype=np.uint8, mode="r", shape=(count, self.bloom.bits // 8)
+        )
+
+    def update(self) -> None:
+        size = self.path.stat().st_size
+        if size == self.meta["indexed"] and len(self.blocks) == self.meta["blocks"]:
+            return
+        with self._file_lock(), open(self.path, "rb") as f:
+            if self.meta_path.exists():
+                self.meta = json.loads(self.meta_path.read_text(encoding="utf-8"))
+            if size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                head = self._head(data, self.meta["head_bytes"])
+                if size < self.meta["indexed"] or head != self.meta["head"]:
+                    self.meta = {"indexed": 0, "blocks": 0, "head": "", "head_bytes": 0}
+                    for path in (self.blocks_path, self.bloom_path):
+                        path.write_bytes(b"")
+                self._append(data, size)
+                self.meta["head_bytes"] = min(256, self.meta["indexed"])
+                self.meta["head"] = self._head(data, self.meta["head_bytes"])
+            tmp = self.meta_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.meta), encoding="utf-8")
+            tmp.replace(self.meta_path)
+        self._load()
+
+    def _append(self, data, size: int) -> None:
+        start = self.meta["indexed"]
+        previous = 0
+        if self.meta["blocks"]:
+            self._load()
+            previous = int(self.blocks[-1, 3])
+        rows, blooms = [], []
+        while start < size:
+            end = self._cut(data, start, size)
+            if end <= 0:
+                break
+            block = data[start:end]
+            head = _TIMESTAMP.search(block)
+            first = block_time(head.groups(), previous) if head else previous
+            tail = last_stamp(block)
+            last = block_time(tail.groups(), first) if tail else first
+            rows.append((start, end, min(first, last), max(first, last)))
+            blooms.append(self.bloom.encode(set(_TOKEN.findall(block.lower()))))
+            previous = last
+            start = end
+        if not rows:
+            return
+        with open(self.blocks_path, "ab") as f:
+            f.write(np.asarray(rows, dtype=np.int64).tobytes())
+        with open(self.bloom_path, "ab") as f:
+            f.write(np.stack(blooms).tobytes())
+        self.meta["indexed"] = start
+        self.meta["blocks"] += len(rows)
+
+    def _cut(self, data, start: int, size: int) -> int:
+        limit = min(size, start + self.block_bytes)
+        newline = data.rfind(b"\n", start, limit)
+        if newline < start:
+            return data.find(b"\n", limit, size) + 1
+        if newline + 1 == size:
+            return size
+        cut = newline
+        while cut > start:
+            if _TIMESTAMP.match(data, cut + 1):
+                return cut + 1
+            cut = data.rfind(b"\n", start, cut)
+        return newline + 1
+
+    def _event_start(self, data, begin: int) -> int:
+        floor = max(0, begin - MAX_EVENT_BYTES)
+        position = begin
+        while position > floor:
+            previous = data.rfind(b"\n", floor, position - 1) + 1
+            if _TIMESTAMP.match(data, previous):
+                return previous
+            if previous <= floor:
+                break
+            position = previous
+        return begin
+
+    def _event_end(self, data, end: int) -> int:
+        ceiling = min(len(data), end + MAX_EVENT_BYTES)
+        while end < ceiling and not _TIMESTAMP.match(data, end):
+            newline = data.find(b"\n", end, ceiling)
+            end = newline + 1 if newline >= 0 else ceiling
+        return end
+
+    def candidates(self, start: int, end: int, keywords: list[bytes]) -> np.ndarray:
+        if not len(self.blocks):
+            return np.zeros(0, dtype=np.int64)
+        hit = (self.blocks[:, 3] >= start) & (self.blocks[:, 2] <= end)
+        if keywords:
+            matched = np.zeros(len(self.blocks), dtype=bool)
+            for keyword in keywords:
+                matched |= self.bloom.matches(self.blooms, keyword)
+            hit &= matched
+        return np.flatnonzero(hit)
+
+    def events(self, rows: np.ndarray):
+        if not len(rows):
+            return
+        selected = set(rows.tolist())
+        with open(self.path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for row in rows:
+                begin, end = int(self.blocks[row, 0]), int(self.blocks[row, 1])
+                if row - 1 not in selected and not _TIMESTAMP.match(data, begin):
+                    begin = self._event_start(data, begin)
+                end = self._event_end(data, end)
+                header, stamp, body = None, None, []
+                for line in data[begin:end].splitlines():
+                    current = line_time(line)
+                    if current is None:
+                        if header is not None:
+                            body.append(line)
+                        continue
+                    if header is not None:
+                        yield stamp, header, body
+                    header, stamp, body = line, current, []
+                if header is not None:
+                    yield stamp, header, body
+
+
+class LogIndex:
+    def __init__(self, directory: Path, index_dir: Path | None = None):
+        self.directory = Path(directory)
+        self.index_dir = Path(index_dir or ROOT / ".crewai_cache" / "log_index")
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        settings = get_settings()
+        self.pattern = settings.log_glob
+        self.block_bytes = settings.log_index_block
+        self.max_signatures = settings.log_max_signatures
+        self.bloom = Bloom(-(-settings.log_index_bloom_bits // 8) * 8)
+        self.files: dict[str, LogFileIndex] = {}
+        self._lock = threading.Lock()
+
+    def refresh(self) -> list[LogFileIndex]:
+        with self._lock:
+            current = {}
+            for path in sorted(self.directory.glob(self.pattern)):
+                if not path.is_file() or path.suffix in {".gz", ".bz2", ".zst", ".xz"}:
+                    continue
+                stat = path.stat()
+                key = f"{stat.st_dev}-{stat.st_ino}"
+                index = self.files.get(key)
+                if index is None:
+                    index = LogFileIndex(path, self.index_dir, self.block_bytes, self.bloom)
+                index.path = path
+                index.update()
+                current[key] = index
+            self.files = current
+            return list(current.values())
+
+    def window(self, query: str, files: list[LogFileIndex]) -> tuple[int, int]:
+        minutes = get_settings().log_window_minutes
+        last = _LAST.search(query)
+        if last:
+            minutes = int(last[1]) * (60 if last[2].lower().startswith("h") else 1)
+        stamps = [
+            to_epoch(f"{day}T{clock}:{seconds or '00'}")
+            for day, clock, seconds in _QUERY_TIME.findall(query)
+        ]
+        if len(stamps) >= 2:
+            return min(stamps), max(stamps)
+        if stamps:
+            half = int(minutes * 30)
+            return stamps[0] - half, stamps[0] + half
+        newest = max((int(index.blocks[-1, 3]) for index in files if len(index.blocks)), default=0)
+        return newest - int(minutes * 60), newest
+
+    def collect(self, files: list[LogFileIndex], start: int, end: int, keywords: list[bytes]):
+        lower, upper = to_stamp(start), to_stamp(end)
+        counts: Counter = Counter()
+        seen: dict[str, list[str]] = {}
+        scanned = 0
+        for index in files:
+            rows = index.candidates(start, end, keywords)
+            scanned += len(rows)
+            for stamp, header, body in index.events(rows):
+                if not lower <= stamp <= upper:
+                    continue
+                text = b"\n".join([header, *body]).lower()
+                if not _ERROR.search(text):
+                    continue
+                if keywords and not any(keyword in text for keyword in keywords):
+                    continue
+                key = signature(header, body)
+                counts[key] += 1
+                first, last = seen.get(key, (stamp, stamp))
+                seen[key] = [min(first, stamp), max(last, stamp)]
+        return counts, seen, scanned
+
+    def search(self, query: str) -> dict:
+        files = self.refresh()
+        start, end = self.window(query, files)
+        keywords = [
+            token
+            for token in dict.fromkeys(_TOKEN.findall(query.lower().encode("utf-8")))
+            if token.decode() not in QUERY_STOPWORDS
+        ]
+        counts, seen, scanned = self.collect(files, start, end, keywords)
+        if keywords and not counts:
+            counts, seen, more = self.collect(files, start, end, [])
+            scanned += more
+            keywords = []
+        return {
+            "window": (to_stamp(start), to_stamp(end)),
+            "keywords": [keyword.decode() for keyword in keywords],
+            "files": len(files),
+            "blocks": sum(len(index.blocks) for index in files),
+            "scanned": scanned,
+            "signatures": [
+                {"signature": key, "count": count, "first": seen[key][0], "last": seen[key][1]}
+                for key, count in counts.most_common(self.max_signatures)
+            ],
+            "total": sum(counts.values()),
+        }
+
+    def summarize(self, query: str) -> str:
+        result = self.search(query)
+        lower, upper = result["window"]
+        upper = upper[11:] if upper[:10] == lower[:10] else upper
+        head = (
+            f"logs {lower}Z..{upper}Z: {result['total']} error events, "
+            f"{len(result['signatures'])} signatures "
+            f"({result['scanned']}/{result['blocks']} blocks in {result['files']} files scanned)"
+        )
+        lines = [
+            f"- {entry['count']}x [{entry['first'][11:]}-{entry['last'][11:]}] "
+            f"{entry['signature']}"
+            for entry in result["signatures"]
+        ]
+        return "\n".join([head, *lines])
+
+
+_index: LogIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_log_index() -> LogIndex | None:
+    global _index
+    log_dir = get_settings().log_dir
+    if not log_dir:
+        return None
+    with _index_lock:
+        if _index is None or _index.directory != Path(log_dir):
+            _index = LogIndex(Path(log_dir))
+        return _index
@@ -0,0 +1,346 @@
+import functools
+import glob
+import hashlib
+import json
+import re
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from ..settings import ROOT, get_settings
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+_COMMENT = re.compile(r"/\*.*?\*/|--[^\n]*", re.DOTALL)
+_STRING = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER = re.compile(r"\b0x[0-9a-f]+\b|(?<![\w.])-?\d+(?:\.\d+)?(?:e[+-]?\d+)?\b|\$\d+")
+_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_ROWS = re.compile(r"(values\s*\(\?\+\))(?:\s*,\s*\(\?\+\))+")
+_SPACE = re.compile(r"\s+")
+
+_PG_DURATION = re.compile(
+    r"duration:\s*([\d.]+)\s*ms\s+(?:statement|(?:execute|parse|bind)\s+[^:]*):\s*(.*)"
+)
+_PG_DB = re.compile(r"\bdb=([\w-]+)")
+_MY_TIME = re.compile(r"Query_time:\s*([\d.]+)")
+_MY_ROWS = re.compile(r"Rows_examined:\s*(\d+)")
+_MY_SCHEMA = re.compile(r"Schema:\s*([\w-]+)")
+_MY_USE = re.compile(r"^use\s+`?([\w-]+)`?;", re.IGNORECASE)
+
+# Latency histogram: 8 log-spaced buckets per decade from 0.1 ms.
+BUCKETS = 72
+BUCKETS_PER_DECADE = 8
+BUCKET_FLOOR_MS = 0.1
+UPPER_EDGES = BUCKET_FLOOR_MS * 10 ** ((np.arange(BUCKETS) + 1) / BUCKETS_PER_DECADE)
+
+# stats columns
+COUNT, TOTAL_MS, MAX_MS, ROWS_EXAMINED, ROWS_SEEN = range(5)
+
+
+@functools.lru_cache(maxsize=8192)
+def fingerprint(statement: str) -> str:
+    text = _COMMENT.sub(" ", statement.strip().rstrip(";")).lower()
+    text = _STRING.sub("?", text)
+    text = _NUMBER.sub("?", text)
+    text = _LIST.sub("(?+)", text)
+    text = _ROWS.sub(r"\1", text)
+    return _SPACE.sub(" ", text).strip()
+
+
+def bucket(milliseconds: np.ndarray) -> np.ndarray:
+    scaled = np.log10(np.maximum(milliseconds, BUCKET_FLOOR_MS) / BUCKET_FLOOR_MS)
+    return np.minimum((scaled * BUCKETS_PER_DECADE).astype(np.int64), BUCKETS - 1)
+
+
+def percentile(histogram: np.ndarray, fraction: float) -> float:
+    counts = np.cumsum(histogram)
+    if not counts[-1]:
+        return 0.0
+    upper = UPPER_EDGES[np.searchsorted(counts, fraction * counts[-1])]
+    return float(upper / 10 ** (0.5 / BUCKETS_PER_DECADE))
+
+
+class SlowLogParser:
+    def __init__(self):
+        self.entry: dict | None = None
+        self.database: str | None = None
+
+    def _start(self, offset: int, **fields) -> dict | None:
+        done = self.finish()
+        self.entry = {"offset": offset, "ms": None, "rows": None, "sql": [], **fields}
+        return done
+
+    def finish(self) -> dict | None:
+        entry, self.entry = self.entry, None
+        if entry is None or entry["ms"] is None or not entry["sql"]:
+            return None
+        entry["sql"] = " ".join(entry["sql"])
+        entry.setdefault("db", self.database)
+        return entry
+
+    def pending_offset(self) -> int | None:
+        return self.entry["offset"] if self.entry is not None else None
+
+    def feed(self, line: str, offset: int) -> dict | None:
+        match = _PG_DURATION.search(line) if "duration:" in line else None
+        if match:
+            database = _PG_DB.search(line)
+            return self._start(
+                offset,
+                format="postgres",
+                ms=float(match[1]),
+                sql=[match[2].strip()],
+                db=database[1] if database else None,
+            )
+        if line.startswith(("# Time:", "# User@Host:")):
+            if self.entry is not None and not self.entry["sql"]:
+                return None
+            return self._start(offset, format="mysql")
+        use = _MY_USE.match(line)
+        if use:
+            self.database = use[1]
+            if self.entry is not None:
+                self.entry["db"] = use[1]
+            return None
+        if self.entry is None:
+            return None
+        if self.entry["format"] == "postgres":
+            if line[:1] in (" ", "\t"):
+                self.entry["sql"].append(line.strip())
+                return None
+            return self.finish()
+        if line.startswith("#"):
+            query_time = _MY_TIME.search(line)
+            if query_time:
+                self.entry["ms"] = float(query_time[1]) * 1000
+                rows = _MY_ROWS.search(line)
+                self.entry["rows"] = int(rows[1]) if rows else None
+            schema = _MY_SCHEMA.search(line)
+            if schema:
+                self.database = self.entry["db"] = schema[1]
+            return None
+        if line.strip() and not line.lower().startswith("set timestamp="):
+            self.entry["sql"].append(line.strip())
+        return None
+
+    def complete_at_eof(self) -> bool:
+        if self.entry is None or not self.entry["sql"]:
+            return False
+        return self.entry["format"] == "postgres" or self.entry["sql"][-1].endswith(";")
+
+
+class SlowQueryDigest:
+    def __init__(self, pattern: str, directory: Path | None = None):
+        self.pattern = pattern
+        self.directory = Path(directory or ROOT / ".crewai_cache" / "slow_queries")
+        self.directory.mkdir(parents=True, exist_ok=True)
+        settings = get_settings()
+        self.max_fingerprints = settings.slow_query_max_fingerprints
+        self.max_bytes = settings.slow_query_max_bytes
+        self.batch_size = settings.slow_query_batch
+        self.top = settings.slow_query_top
+        self.state_path = self.directory / "state.json"
+        self.lock_path = self.directory / ".lock"
+        self._lock = threading.Lock()
+        self._loaded_mtime: float | None = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self.offsets: dict[str, int] = {}
+        self.keys: list[dict] = []
+        self.index: dict[str, int] = {}
+        self.stats = np.zeros((0, 5), dtype=np.float64)
+        self.histograms = np.zeros((0, BUCKETS), dtype=np.uint32)
+
+    def _file_lock(self):
+        handle = open(self.lock_path, "a")
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        return handle
+
+    def _load(self) -> None:
+        try:
+            mtime = self.state_path.stat().st_mtime
+        except FileNotFoundError:
+            return
+        if mtime == self._loaded_mtime:
+            return
+        state = json.loads(self.state_path.read_text(encoding="utf-8"))
+        self.offsets = state["offsets"]
+        self.keys = state["fingerprints"]
+        self.index = {entry["id"]: row for row, entry in enumerate(self.keys)}
+        arrays = np.load(self.directory / "aggregates.npz")
+        self.stats, self.histograms = arrays["stats"], arrays["histograms"]
+        self._loaded_mtime = mtime
+
+    def _save(self) -> None:
+        with open(self.directory / "aggregates.npz.tmp", "wb") as f:
+            np.savez(f, stats=self.stats, histograms=self.histograms)
+        (self.directory / "aggregates.npz.tmp").replace(self.directory / "aggregates.npz")
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(
+            json.dumps({"offsets": self.offsets, "fingerprints": self.keys}), encoding="utf-8"
+        )
+        tmp.replace(self.state_path)
+        self._loaded_mtime = self.state_path.stat().st_mtime
+
+    def _row(self, entry: dict) -> int:
+        text = fingerprint(entry["sql"])
+        key = hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+        row = self.index.get(key)
+        if row is None:
+            row = len(self.keys)
+            self.index[key] = row
+            self.keys.append(
+                {"id": key, "fingerprint": text[:300], "sample": entry["sql"][:300], "db": None}
+            )
+        if entry.get("db"):
+            self.keys[row]["db"] = entry["db"]
+        return row
+
+    def _apply(self, batch: list[tuple[int, float, float | None]]) -> None:
+        if not batch:
+            return
+        rows = np.asarray([row for row, _, _ in batch], dtype=np.int64)
+        ms = np.asarray([value for _, value, _ in batch], dtype=np.float64)
+        examined = np.asarray([value or 0 for _, _, value in batch], dtype=np.float64)
+        seen = np.asarray([value is not None for _, _, value in batch], dtype=np.float64)
+        grow = len(self.keys) - len(self.stats)
+        if grow > 0:
+            self.stats = np.vstack([self.stats, np.zeros((grow, 5))])
+            self.histograms = np.vstack(
+                [self.histograms, np.zeros((grow, BUCKETS), dtype=np.uint32)]
+            )
+        np.add.at(self.stats[:, COUNT], rows, 1)
+        np.add.at(self.stats[:, TOTAL_MS], rows, ms)
+        np.maximum.at(self.stats[:, MAX_MS], rows, ms)
+        np.add.at(self.stats[:, ROWS_EXAMINED], rows, examined)
+        np.add.at(self.stats[:, ROWS_SEEN], rows, seen)
+        np.add.at(self.histograms, (rows, bucket(ms)), 1)
+        batch.clear()
+
+    def _evict(self) -> None:
+        if len(self.keys) <= self.max_fingerprints:
+            return
+        keep = np.sort(np.argsort(-self.stats[:, TOTAL_MS])[: self.max_fingerprints])
+        self.keys = [self.keys[row] for row in keep]
+        self.index = {entry["id"]: row for row, entry in enumerate(self.keys)}
+        self.stats, self.histograms = self.stats[keep], self.histograms[keep]
+
+    def _ingest_file(self, path: Path, budget: int) -> tuple[int, int]:
+        stat = path.stat()
+        key = f"{stat.st_dev}-{stat.st_ino}"
+        offset = self.offsets.get(key, 0)
+        if offset > stat.st_size:
+            offset = 0
+        parser = SlowLogParser()
+        batch: list[tuple[int, float, float | None]] = []
+        committed = position = offset
+        with open(path, "rb") as f:
+            f.seek(offset)
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+                entry = parser.feed(raw.decode("utf-8", "replace").rstrip("\n"), position)
+                position += len(raw)
+                if entry is not None:
+                    batch.append((self._row(entry), entry["ms"], entry["rows"]))
+                    if len(batch) >= self.batch_size:
+                        self._apply(batch)
+                        self._evict()
+                pending = parser.pending_offset()
+                committed = position if pending is None else pending
+                if entry is not None and position - offset >= budget:
+                    break
+        if parser.complete_at_eof() and position == stat.st_size:
+            entry = parser.finish()
+            if entry is not None:
+                batch.append((self._row(entry), entry["ms"], entry["rows"]))
+            committed = position
+        self._apply(batch)
+        self._evict()
+        self.offsets[key] = committed
+        return committed - offset, stat.st_size - committed
+
+    def ingest(self) -> tuple[int, int]:
+        read = pending = 0
+        with self._lock, self._file_lock():
+            self._load()
+            before = self.stats[:, COUNT].sum()
+            for name in sorted(glob.glob(self.pattern)):
+                path = Path(name)
+                if path.is_file():
+                    done, left = self._ingest_file(path, max(0, self.max_bytes - read))
+                    read += done
+                    pending += left
+            self._save()
+            return int(self.stats[:, COUNT].sum() - before), pending
+
+    def top_queries(self, database: str | None = None) -> list[dict]:
+        rows = np.arange(len(self.keys))
+        if database:
+            rows = np.asarray([row for row in rows if self.keys[row]["db"] == database])
+        if not len(rows):
+            return []
+        order = rows[np.argsort(-self.stats[rows, TOTAL_MS])][: self.top]
+        results = []
+        for row in order:
+            stats, histogram = self.stats[row], self.histograms[row]
+            results.append(
+                {
+                    **self.keys[row],
+                    "count": int(stats[COUNT]),
+                    "total_ms": float(stats[TOTAL_MS]),
+                    "max_ms": float(stats[MAX_MS]),
+                    "p50_ms": percentile(histogram, 0.50),
+                    "p95_ms": percentile(histogram, 0.95),
+                    "p99_ms": percentile(histogram, 0.99),
+                    "rows_examined": (
+                        stats[ROWS_EXAMINED] / stats[ROWS_SEEN] if stats[ROWS_SEEN] else None
+                    ),
+                }
+            )
+        return results
+
+    def digest(self, query: str) -> str:
+        added, pending = self.ingest()
+        total = int(self.stats[:, COUNT].sum())
+        words = set(re.findall(r"[\w-]+", query.lower()))
+        databases = {entry["db"] for entry in self.keys if entry["db"]}
+        database = next((name for name in databases if name.lower() in words), None)
+        top = self.top_queries(database)
+        scope = f" on {database}" if database else ""
+        backlog = f", {pending / 2**20:.1f} MiB of log pending" if pending else ""
+        head = (
+            f"slow queries{scope}: {len(self.keys)} fingerprints, "
+            f"{total} statements ({added} new{backlog})"
+        )
+        lines = []
+        for entry in top:
+            examined = entry["rows_examined"]
+            rows = f", ~{examined:.0f} rows examined" if examined else ""
+            lines.append(
+                f"- {entry['count']}x p50 {entry['p50_ms']:.0f}ms p95 {entry['p95_ms']:.0f}ms "
+                f"p99 {entry['p99_ms']:.0f}ms, {entry['total_ms'] / 1000:.1f}s total{rows}: "
+                f"{entry['fingerprint'][:160]}"
+            )
+        return "\n".join([head, *lines])
+
+
+_digest: SlowQueryDigest | None = None
+_digest_lock = threading.Lock()
+
+
+def get_slow_query_digest() -> SlowQueryDigest | None:
+    global _digest
+    pattern = get_settings().slow_query_log
+    if not pattern:
+        return None
+    with _digest_lock:
+        if _digest is None or _digest.pattern != pattern:
+            _digest = SlowQueryDigest(pattern)
+        return _digest
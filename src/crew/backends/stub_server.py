@@ -0,0 +1,83 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from .http import TOOL_ROUTES
+
+STUB_RESPONSES = {
+    "/metrics": {"error_rate": "4.8%", "p95_latency_ms": 870, "rps": 1250, "trend": "rising"},
+    "/logs": {"top_error": "NullPointerException in PaymentHandler", "count": 412},
+    "/deploys": {"last_deploy": "payments-api v2.14.0", "age_minutes": 30, "rollback": "v2.13.4"},
+    "/config-diffs": {"changed_keys": ["db.pool.max_size"], "critical": False},
+    "/db/metrics": {"cpu": "62%", "connections": "180/200", "slow_queries_per_min": 3},
+    "/db/slow-queries": {"top": "SELECT * FROM orders WHERE customer_id = ?", "p95_ms": 420},
+    "/alerts": {"open_alerts": 0, "iocs": []},
+    "/intel": {"matches": 0},
+    "/incidents/updates": {"status": "recorded"},
+    "/status/updates": {"status": "drafted"},
+}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    latency = 0.0
+
+    def _respond(self, params: dict) -> None:
+        path = urlparse(self.path).path
+        payload = STUB_RESPONSES.get(path)
+        if payload is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        time.sleep(self.latency)
+        body = json.dumps({**payload, "request": params}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        query = parse_qs(urlparse(self.path).query)
+        self._respond({key: values[0] for key, values in query.items()})
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", "0"))
+        self._respond(json.loads(self.rfile.read(length) or b"{}"))
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+def start_stub_server(
+    host: str = "127.0.0.1", port: int = 0, latency: float = 0.0
+) -> tuple[ThreadingHTTPServer, str]:
+    handler = type("ConfiguredStubHandler", (StubHandler,), {"latency": latency})
+    server = ThreadingHTTPServer((host, port), handler)
+    thread = threading.Thread(target=server.serve_forever, name="stub-backend", daemon=True)
+    thread.start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def stub_environment(url: str) -> dict[str, str]:
+    backends = {backend for backend, _, _, _ in TOOL_ROUTES.values()}
+    return {f"TOOL_BACKEND_{backend.upper()}_URL": url for backend in sorted(backends)}
+
+
+def main() -> None:
+    port = int(os.getenv("STUB_BACKEND_PORT", "8765"))
+    latency = float(os.getenv("STUB_BACKEND_LATENCY", "0.05"))
+    server, url = start_stub_server(port=port, latency=latency)
+    for key, value in stub_environment(url).items():
+        print(f"{key}={value}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
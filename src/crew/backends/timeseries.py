@@ -0,0 +1,236 @@
+import csv
+import json
+import re
+import threading
+import time
+import zlib
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+from ..settings import ROOT, get_settings
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9_.-]+")
+_DB_ENTITY = re.compile(r"(^|[-_.])(db|pg|mysql|postgres|redis)([-_.\d]|$)")
+
+MIN_SEGMENT = 3
+
+HIGHER_IS_WORSE = (
+    "error", "latency", "p50", "p90", "p95", "p99", "cpu", "connections", "slow",
+    "lag", "queue", "wait", "deadlock", "timeout", "memory", "5xx",
+)
+
+
+def is_db_series(entity: str, metric: str) -> bool:
+    return metric.startswith(("db.", "db_")) or bool(_DB_ENTITY.search(entity))
+
+
+def to_epoch(value: str) -> float:
+    value = value.strip()
+    moment = datetime.fromisoformat(value[:-1] + "+00:00" if value.endswith("Z") else value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+
+def parse_times(values: list[str]) -> np.ndarray:
+    try:
+        return np.asarray(values, dtype=np.float64).astype(np.int64)
+    except ValueError:
+        unique, inverse = np.unique(np.asarray(values), return_inverse=True)
+        epochs = np.asarray([to_epoch(value) for value in unique.tolist()])
+        return epochs[inverse].astype(np.int64)
+
+
+def read_columns(path: Path) -> dict[str, list]:
+    if path.suffix == ".parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError as exc:
+            raise RuntimeError("Install pyarrow to read Parquet metrics.") from exc
+        table = pq.read_table(path)
+        return {name: table.column(name).to_pylist() for name in table.column_names}
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        header = [name.strip().lower() for name in next(reader)]
+        columns = list(zip(*reader)) or [()] * len(header)
+    return {name: list(column) for name, column in zip(header, columns)}
+
+
+def to_frame(columns: dict[str, list]) -> tuple[list[tuple[str, str]], np.ndarray, np.ndarray]:
+    times = parse_times([str(value) for value in columns["timestamp"]])
+    entities = columns.get("entity") or ["-"] * len(times)
+    keys = np.asarray(
+        [f"{entity}\t{metric}" for entity, metric in zip(entities, columns["metric"])]
+    )
+    names, rows = np.unique(keys, return_inverse=True)
+    grid = np.unique(times)
+    step = int(np.median(np.diff(grid))) if len(grid) > 1 else 1
+    cols = ((times - grid[0]) // step).astype(np.int64)
+    values = np.full((len(names), int(cols.max()) + 1), np.nan, dtype=np.float32)
+    values[rows, cols] = np.asarray(columns["value"], dtype=np.float32)
+    filled = np.where(np.isnan(values), 0, np.arange(values.shape[1]))
+    np.maximum.accumulate(filled, axis=1, out=filled)
+    values = values[np.arange(len(names))[:, None], filled]
+    first = np.nan_to_num(values[np.arange(len(names)), np.argmax(~np.isnan(values), axis=1)])
+    values = np.where(np.isnan(values), first[:, None], values)
+    series = [tuple(name.split("\t", 1)) for name in names.tolist()]
+    return series, grid[0] + step * np.arange(values.shape[1]), values
+
+
+def score_frame(
+    values: np.ndarray, recent: int, worse_up: np.ndarray, baseline: int | None = None
+) -> dict[str, np.ndarray]:
+    if baseline:
+        values = values[:, -(baseline + recent) :]
+    count, length = values.shape
+    recent = max(1, min(recent, length // 2))
+    base = values[:, :-recent]
+    median = np.median(base, axis=1)
+    mad = np.median(np.abs(base - median[:, None]), axis=1) * 1.4826
+    step_mad = np.median(np.abs(np.diff(values, axis=1)), axis=1) * 1.4826 / np.sqrt(2)
+    scale = np.maximum(np.minimum(mad, step_mad), np.maximum(np.abs(median) * 0.01, 1e-6))
+    current = np.median(values[:, -recent:], axis=1)
+    level = (current - median) / scale
+
+    z = (values - median[:, None]) / scale[:, None]
+    sums = np.cumsum(z, axis=1)
+    split = np.arange(MIN_SEGMENT, length - MIN_SEGMENT + 1)
+    before = sums[:, split - 1]
+    shift = (sums[:, -1:] - before) / (length - split) - before / split
+    strength = np.abs(shift) * np.sqrt(split * (length - split) / length)
+    best = np.argmax(strength, axis=1)
+    effect = shift[np.arange(count), best]
+
+    score = np.where(np.abs(effect) > np.abs(level), effect, level)
+    score = np.where(worse_up, np.maximum(score, 0.0), np.abs(score))
+    return {
+        "score": score,
+        "baseline": median,
+        "current": current,
+        "onset": split[best] - length,
+    }
+
+
+class SeriesFrame:
+    def __init__(self, series: list[tuple[str, str]], times: np.ndarray, values: np.ndarray):
+        self.series = series
+        self.times = times
+        self.values = values
+        self.db = np.asarray([is_db_series(entity, metric) for entity, metric in series])
+        self.worse_up = np.asarray(
+            [any(word in metric.lower() for word in HIGHER_IS_WORSE) for _, metric in series]
+        )
+
+
+class SeriesStore:
+    def __init__(self, directory: Path, cache_dir: Path | None = None):
+        self.directory = Path(directory)
+        self.cache_dir = Path(cache_dir or ROOT / ".crewai_cache" / "timeseries")
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        settings = get_settings()
+        self.recent = settings.metrics_recent_points
+        self.baseline = settings.metrics_baseline_points
+        self.top = settings.metrics_top_anomalies
+        self.frames: dict[Path, tuple[float, int, SeriesFrame]] = {}
+        self._lock = threading.Lock()
+
+    def _columnar(self, path: Path) -> SeriesFrame:
+        stat = path.stat()
+        key = self.cache_dir / f"{path.stem}-{zlib.crc32(str(path.resolve()).encode()):08x}"
+        meta_path = key / "series.json"
+        if meta_path.exists():
+            meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            if meta["source"] == [stat.st_mtime, stat.st_size]:
+                return SeriesFrame(
+                    [tuple(name) for name in meta["series"]],
+                    np.load(key / "times.npy"),
+                    np.load(key / "values.npy", mmap_mode="r"),
+                )
+        series, times, values = to_frame(read_columns(path))
+        key.mkdir(parents=True, exist_ok=True)
+        np.save(key / "times.npy", times)
+        np.save(key / "values.npy", values)
+        meta = {"source": [stat.st_mtime, stat.st_size], "series": series}
+        meta_path.write_text(json.dumps(meta), encoding="utf-8")
+        return SeriesFrame(series, times, values)
+
+    def refresh(self) -> list[SeriesFrame]:
+        with self._lock:
+            current = {}
+            paths = [*self.directory.glob("*.csv"), *self.directory.glob("*.parquet")]
+            for path in sorted(paths):
+                stat = path.stat()
+                cached = self.frames.get(path)
+                if cached is None or cached[:2] != (stat.st_mtime, stat.st_size):
+                    cached = (stat.st_mtime, stat.st_size, self._columnar(path))
+                current[path] = cached
+            self.frames = current
+            return [frame for _, _, frame in current.values()]
+
+    def anomalies(self, query: str, db: bool) -> tuple[list[dict], int, float]:
+        words = set(_TOKEN.findall(query.lower()))
+        frames = self.refresh()
+        started = time.perf_counter()
+        found, scored = [], 0
+        for frame in frames:
+            mask = frame.db == db
+            named = np.asarray(
+                [bool(words & {entity.lower(), metric.lower()}) for entity, metric in frame.series]
+            )
+            if (named & mask).any():
+                mask &= named
+            rows = np.flatnonzero(mask)
+            if not len(rows) or frame.values.shape[1] < 2 * MIN_SEGMENT + 2:
+                continue
+            scored += len(rows)
+            window = np.asarray(frame.values[:, -(self.baseline + self.recent) :][rows])
+            result = score_frame(window, self.recent, frame.worse_up[rows])
+            for position in np.argsort(-result["score"])[: self.top]:
+                entity, metric = frame.series[rows[position]]
+                found.append(
+                    {
+                        "entity": entity,
+                        "metric": metric,
+                        "score": float(result["score"][position]),
+                        "baseline": float(result["baseline"][position]),
+                        "current": float(result["current"][position]),
+                        "onset": int(frame.times[result["onset"][position]]),
+                    }
+                )
+        found.sort(key=lambda item: item["score"], reverse=True)
+        return found[: self.top], scored, time.perf_counter() - started
+
+    def digest(self, query: str, db: bool = False) -> str:
+        threshold = get_settings().anomaly_min_score
+        found, scored, elapsed = self.anomalies(query, db)
+        flagged = [item for item in found if item["score"] >= threshold]
+        head = (
+            f"{'db ' if db else ''}metrics: {scored} series scored in {elapsed * 1000:.0f}ms, "
+            f"{len(flagged)} anomalous (score >= {threshold:g})"
+        )
+        lines = []
+        for item in flagged:
+            direction = "up" if item["current"] >= item["baseline"] else "down"
+            onset = time.strftime("%H:%M", time.gmtime(item["onset"]))
+            lines.append(
+                f"- {item['entity']} {item['metric']} {direction} {item['baseline']:.4g} -> "
+                f"{item['current']:.4g} (score {item['score']:.1f}, shift at {onset}Z)"
+            )
+        return "\n".join([head, *lines])
+
+
+_store: SeriesStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_series_store() -> SeriesStore | None:
+    global _store
+    metrics_dir = get_settings().metrics_dir
+    if not metrics_dir:
+        return None
+    with _store_lock:
+        if _store is None or _store.directory != Path(metrics_dir):
+            _store = SeriesStore(Path(metrics_dir))
+        return _store
@@ -0,0 +1,146 @@
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Iterable, Iterator
+
+from .tracing import start_trace
+
+if TYPE_CHECKING:
+    from .factory import CrewFactory
+
+
+def parse_incidents(lines: Iterable[str]) -> Iterator[dict]:
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            record = line
+        if isinstance(record, str):
+            record = {"incident": record}
+        elif not isinstance(record, dict):
+            record = {"incident": line}
+        incident = record.get("incident") or record.get("input") or record.get("description")
+        if not incident:
+            continue
+        incident = str(incident)
+        incident_id = record.get("id") or hashlib.sha256(incident.encode("utf-8")).hexdigest()[:12]
+        yield {"id": str(incident_id), "incident": incident}
+
+
+def load_checkpoint(path: Path) -> set[str]:
+    if not path.exists():
+        return set()
+    done = set()
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            done.add(json.loads(line)["id"])
+        except (json.JSONDecodeError, KeyError, TypeError):
+            continue
+    return done
+
+
+def total_tokens(result) -> int:
+    usage = getattr(result, "token_usage", None)
+    return int(getattr(usage, "total_tokens", 0) or 0)
+
+
+class BatchRunner:
+    def __init__(
+        self,
+        output: IO[str],
+        checkpoint: Path,
+        concurrency: int,
+        factory: "CrewFactory | None" = None,
+    ):
+        self.output = output
+        self.checkpoint = checkpoint
+        self.concurrency = max(1, concurrency)
+        if factory is None:
+            from .factory import CrewFactory
+
+            factory = CrewFactory(pool_size=self.concurrency)
+        self.factory = factory
+        self.stats = {"completed": 0, "failed": 0, "skipped": 0, "tokens": 0}
+        self._lock = threading.Lock()
+
+    def run_one(self, record: dict) -> dict:
+        started = time.perf_counter()
+        try:
+            with start_trace("incident-war-room") as trace:
+                with self.factory.crew(record["incident"]) as crew:
+                    result = crew.kickoff()
+            return {
+                **record,
+                "status": "ok",
+                "result": result.raw,
+                "tokens": total_tokens(result),
+                "seconds": round(time.perf_counter() - started, 3),
+                "trace_id": trace.trace_id,
+                "llm_calls_saved": trace.root.attributes.get("llm_calls_saved", 0),
+                "incident_path": trace.root.attributes.get("incident_path"),
+            }
+        except Exception as exc:
+            return {
+                **record,
+                "status": "error",
+                "error": f"{type(exc).__name__}: {exc}",
+                "seconds": round(time.perf_counter() - started, 3),
+            }
+
+    def emit(self, outcome: dict) -> None:
+        with self._lock:
+            self.output.write(json.dumps(outcome) + "\n")
+            self.output.flush()
+            if outcome["status"] == "ok":
+                self.stats["completed"] += 1
+                self.stats["tokens"] += outcome.get("tokens", 0)
+                with open(self.checkpoint, "a", encoding="utf-8") as f:
+                    f.write(json.dumps({"id": outcome["id"]}) + "\n")
+            else:
+                self.stats["failed"] += 1
+
+    def run(self, records: Iterable[dict]) -> dict:
+        done = load_checkpoint(self.checkpoint)
+        started = time.perf_counter()
+        in_flight = threading.BoundedSemaphore(self.concurrency * 2)
+
+        def work(record: dict) -> None:
+            try:
+                self.emit(self.run_one(record))
+            finally:
+                in_flight.release()
+
+        with redirect_stdout(sys.stderr):
+            with ThreadPoolExecutor(
+                max_workers=self.concurrency, thread_name_prefix="incident"
+            ) as pool:
+                for record in records:
+                    if record["id"] in done:
+                        self.stats["skipped"] += 1
+                        continue
+                    in_flight.acquire()
+                    pool.submit(work, record)
+
+        elapsed = time.perf_counter() - started
+        completed = self.stats["completed"]
+        return {
+            **self.stats,
+            "elapsed_seconds": round(elapsed, 2),
+            "incidents_per_minute": round(completed / elapsed * 60, 2) if elapsed else 0.0,
+            "tokens_per_incident": round(self.stats["tokens"] / completed, 1) if completed else 0.0,
+        }
+
+
+def default_checkpoint(batch_path: str) -> Path:
+    if batch_path == "-":
+        return Path(os.getcwd()) / ".batch_checkpoint.jsonl"
+    return Path(f"{batch_path}.checkpoint.jsonl")
@@ -0,0 +1,152 @@
+import re
+
+from .ratelimit import estimate_tokens
+from .settings import get_settings
+from .tracing import current_trace
+
+ROLE_KEYWORDS = {
+    "sre_triage": (
+        "error", "5xx", "500", "latency", "timeout", "cpu", "memory", "log",
+        "metric", "alert", "outage", "down", "slow",
+    ),
+    "app_engineer": (
+        "deploy", "release", "rollback", "config", "version", "flag", "build",
+        "migration", "exception", "stack",
+    ),
+    "database_specialist": (
+        "db", "database", "query", "sql", "connection", "pool", "replica",
+        "lock", "index", "postgres", "mysql", "migration",
+    ),
+    "security_analyst": (
+        "security", "auth", "login", "token", "ddos", "attack", "ioc",
+        "breach", "suspicious", "ip", "waf", "credential",
+    ),
+}
+
+ROLE_BUDGET_SCALE = {"incident_commander": 1.5, "comms_lead": 0.5}
+
+FINDING_TERMS = (
+    "root cause", "cause", "rollback", "roll back", "severity", "sev", "owner",
+    "action", "mitigat", "recommend", "impact", "evidence", "risk", "fix",
+    "contain", "revert", "restart", "scale",
+)
+
+MIN_CLIP_TOKENS = 16
+
+_BULLET = re.compile(r"^\s*(?:[-*•]|#+|\d+[.)])\s*")
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+_DIGITS = re.compile(r"\d+")
+
+
+def collapse_repeats(lines: list[str]) -> list[str]:
+    counts: dict[str, int] = {}
+    first: dict[str, str] = {}
+    for line in lines:
+        signature = _DIGITS.sub("#", line)
+        counts[signature] = counts.get(signature, 0) + 1
+        first.setdefault(signature, line)
+    return [
+        line if counts[signature] == 1 else f"{line} (repeated {counts[signature]}x)"
+        for signature, line in first.items()
+    ]
+
+
+def clip_to_tokens(text: str, tokens: int) -> str:
+    limit = tokens * 4
+    if len(text) <= limit:
+        return text
+    return text[: max(1, limit - 3)].rstrip() + "..."
+
+
+def select_within_budget(items: list[str], priority: list[bool], budget: int) -> dict[int, str]:
+    chosen: dict[int, str] = {}
+    used = 0
+    for wanted in (True, False):
+        for index, item in enumerate(items):
+            if priority[index] != wanted or index in chosen:
+                continue
+            remaining = budget - used
+            tokens = estimate_tokens(item)
+            if tokens > remaining:
+                if chosen and remaining < MIN_CLIP_TOKENS:
+                    continue
+                item = clip_to_tokens(item, max(1, remaining))
+                tokens = estimate_tokens(item)
+            chosen[index] = item
+            used += tokens
+    return dict(sorted(chosen.items()))
+
+
+def compress_findings(raw: str, budget: int) -> str:
+    if estimate_tokens(raw) <= budget:
+        return raw
+    items: list[str] = []
+    seen: set[str] = set()
+    for line in raw.splitlines():
+        line = _BULLET.sub("", line).strip().strip("*").strip()
+        if not line or (line.endswith(":") and len(line) < 60):
+            continue
+        for sentence in _SENTENCE.split(line):
+            key = sentence.lower()
+            if sentence and key not in seen:
+                seen.add(key)
+                items.append(sentence)
+    priority = [any(term in item.lower() for term in FINDING_TERMS) for item in items]
+    chosen = select_within_budget(items, priority, budget)
+    return "Key findings:\n" + "\n".join(f"- {item}" for item in chosen.values())
+
+
+class IncidentContext:
+    def __init__(self, incident_input: str):
+        self.text = incident_input.strip()
+        settings = get_settings()
+        self.view_tokens = settings.context_view_tokens
+        self.findings_tokens = settings.context_findings_tokens
+        self.stats = {"baseline_tokens": 0, "sent_tokens": 0}
+
+    def _record(self, baseline: int, sent: int) -> None:
+        self.stats["baseline_tokens"] += baseline
+        self.stats["sent_tokens"] += sent
+        trace = current_trace()
+        if trace is not None:
+            trace.root.add("context_baseline_tokens", baseline)
+            trace.root.add("context_sent_tokens", sent)
+
+    def view(self, role: str) -> str:
+        budget = int(self.view_tokens * ROLE_BUDGET_SCALE.get(role, 1.0))
+        full_tokens = estimate_tokens(self.text)
+        if full_tokens <= budget:
+            self._record(full_tokens, full_tokens)
+            return self.text
+
+        lines = collapse_repeats([line.strip() for line in self.text.splitlines() if line.strip()])
+        keywords = ROLE_KEYWORDS.get(role, ())
+        priority = [
+            index == 0 or any(keyword in line.lower() for keyword in keywords)
+            for index, line in enumerate(lines)
+        ]
+        chosen = select_within_budget(lines, priority, budget)
+        selected = list(chosen.values())
+        omitted = len(lines) - len(chosen)
+        if omitted:
+            selected.append(f"[{omitted} less relevant lines omitted]")
+        view = "\n".join(selected)
+        self._record(full_tokens, estimate_tokens(view))
+        return view
+
+    def findings_filter(self, consumers: int = 1, scale: float = 1.0):
+        budget = int(self.findings_tokens * scale)
+
+        def compress(raw: str) -> str:
+            compressed = compress_findings(raw, budget)
+            self._record(
+                estimate_tokens(raw) * consumers,
+                estimate_tokens(compressed) * consumers,
+            )
+            return compressed
+
+        return compress
+
+    def reduction(self) -> float:
+        baseline = self.stats["baseline_tokens"]
+        return 1 - self.stats["sent_tokens"] / baseline if baseline else 0.0
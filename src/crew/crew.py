@@ -1,16 +1,26 @@
-import os
 from pathlib import Path
 
-from crewai import Crew, Process
-from crewai.memory.short_term.short_term_memory import ShortTermMemory
+from typing import TYPE_CHECKING
 
-from .agents import build_agents, build_llm
+from crewai import Crew, Process, Task
+
+from .agents import build_agents
+from .incidents import get_incident_index
+from .llm import build_llm
+from .memory import get_local_storage, memory_embedder
+from .settings import get_settings
 from .tasks import build_tasks
+from .topology import AdaptiveRouter, DagRouter
+from .tracing import current_trace, emit, record_step
+
+if TYPE_CHECKING:
+    from crewai.memory.entity.entity_memory import EntityMemory
+    from crewai.memory.short_term.short_term_memory import ShortTermMemory
 
 
 def build_embedder_config() -> dict | None:
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if not api_key:
+    api_key = get_settings().google_api_key
+    if not api_key or memory_embedder() == "local":
         return None
 
     return {
@@ -23,45 +33,107 @@ def build_embedder_config() -> dict | None:
 
 
 def build_memory_path() -> str:
-    model = os.getenv("LLM_MODEL", "default")
+    model = get_settings().llm_model or "default"
     safe = model.replace("/", "_").replace(":", "_")
     root = Path(__file__).resolve().parents[2]
     return str(root / ".crewai_memory" / safe)
 
 
-def memory_enabled() -> bool:
-    value = os.getenv("MEMORY_ENABLED", "true").strip().lower()
-    return value in {"1", "true", "yes", "y"}
+def parallel_max_workers(task_count: int) -> int:
+    workers = get_settings().parallel_max_workers or task_count
+    return max(1, min(workers, task_count))
+
 
+def build_short_term_memory(embedder: dict | None) -> "ShortTermMemory | None":
+    from crewai.memory.short_term.short_term_memory import ShortTermMemory
+
+    if memory_embedder() == "local":
+        return ShortTermMemory(storage=get_local_storage("short_term"))
+    if not embedder:
+        return None
+    return ShortTermMemory(embedder_config=embedder, path=build_memory_path())
 
-def safe_mode_enabled() -> bool:
-    value = os.getenv("SAFE_MODE", "false").strip().lower()
-    return value in {"1", "true", "yes", "y"}
 
+def build_entity_memory() -> "EntityMemory | None":
+    if memory_embedder() != "local":
+        return None
+    from crewai.memory.entity.entity_memory import EntityMemory
 
-def survival_mode_enabled() -> bool:
-    value = os.getenv("SURVIVAL_MODE", "false").strip().lower()
-    return value in {"1", "true", "yes", "y"}
+    return EntityMemory(storage=get_local_storage("entities"))
 
 
-def build_crew(incident_input: str, tools: dict | None = None) -> Crew:
-    agents = build_agents(tools)
-    tasks = build_tasks(agents, incident_input)
-    survival_mode = survival_mode_enabled()
-    safe_mode = safe_mode_enabled()
-    use_memory = memory_enabled() and not safe_mode and not survival_mode
+def find_prior_incident(incident_input: str) -> dict | None:
+    index = get_incident_index()
+    matches = index.lookup(incident_input) if index is not None else []
+    if not matches or matches[0]["score"] < get_settings().incident_seed_score:
+        return None
+    return matches[0]
+
+
+def build_incident_recorder(incident_input: str, commander: Task):
+    def record_incident(output):
+        index = get_incident_index()
+        if index is not None:
+            resolution = commander.output.raw if commander.output else ""
+            index.record(incident_input, resolution, str(getattr(output, "raw", output)))
+        return output
+
+    return record_incident
+
+
+def build_crew(
+    incident_input: str,
+    tools: dict | None = None,
+    agents: dict | None = None,
+    manager_llm=None,
+    short_term_memory: "ShortTermMemory | None" = None,
+    entity_memory: "EntityMemory | None" = None,
+) -> Crew:
+    agents = agents or build_agents(tools)
+    prior = find_prior_incident(incident_input)
+    settings = get_settings()
+    known_issue = prior is not None and prior["score"] >= settings.incident_known_score
+    tasks = build_tasks(agents, incident_input, prior=prior, known_issue=known_issue)
+    trace = current_trace()
+    if trace is not None:
+        trace.root.set(
+            incident_path="known_issue" if known_issue else "seeded" if prior else "full",
+            prior_incident_score=prior["score"] if prior else None,
+        )
+    survival_mode = settings.survival_mode
+    safe_mode = settings.safe_mode
+    adaptive_mode = settings.adaptive_mode and not survival_mode
+    parallel_mode = settings.parallel_mode and not survival_mode and not adaptive_mode
+    local_memory = memory_embedder() == "local"
+    use_memory = settings.memory_enabled and (local_memory or not (safe_mode or survival_mode))
     embedder = build_embedder_config() if use_memory else None
-    short_term_memory = None
-    if use_memory and embedder:
-        memory_path = build_memory_path()
-        short_term_memory = ShortTermMemory(embedder_config=embedder, path=memory_path)
+    if not use_memory:
+        short_term_memory = entity_memory = None
+    else:
+        short_term_memory = short_term_memory or build_short_term_memory(embedder)
+        entity_memory = entity_memory or build_entity_memory()
 
     crew_agents = list(agents.values())
     crew_tasks = list(tasks.values())
-    process = Process.sequential if (safe_mode or survival_mode) else Process.hierarchical
-    manager_llm = None if (safe_mode or survival_mode) else build_llm()
-
-    if survival_mode:
+    hierarchical = settings.llm_manager and not (
+        known_issue or safe_mode or survival_mode or parallel_mode or adaptive_mode
+    )
+    process = Process.hierarchical if hierarchical else Process.sequential
+    if not hierarchical:
+        manager_llm = None
+    elif manager_llm is None:
+        manager_llm = build_llm(lane="synthesis")
+    before_kickoff = []
+    after_kickoff = []
+    if not known_issue:
+        after_kickoff = [build_incident_recorder(incident_input, tasks["commander"])]
+
+    if known_issue:
+        crew_agents = [agents["incident_commander"], agents["comms_lead"]]
+        crew_tasks = [tasks["commander"], tasks["comms"]]
+        skipped = ["triage", "app_check", "db_check", "security_check"]
+        emit("tasks_skipped", tasks=skipped, reason="known issue")
+    elif survival_mode:
         crew_agents = [
             agents["incident_commander"],
             agents["sre_triage"],
@@ -72,8 +144,23 @@ def build_crew(incident_input: str, tools: dict | None = None) -> Crew:
             tasks["commander"],
             tasks["comms"],
         ]
+    elif adaptive_mode:
+        router = AdaptiveRouter(tasks, parallel_max_workers(3))
+        tasks["triage"].output_filter = router.capture(tasks["triage"].output_filter)
+        before_kickoff = [router]
+        crew_tasks = [tasks["commander"], tasks["comms"]]
+    elif parallel_mode or not (hierarchical or safe_mode):
+        specialists = [
+            tasks["triage"],
+            tasks["app_check"],
+            tasks["db_check"],
+            tasks["security_check"],
+        ]
+        workers = parallel_max_workers(len(specialists)) if parallel_mode else 1
+        before_kickoff = [DagRouter(specialists, workers)]
+        crew_tasks = [tasks["commander"], tasks["comms"]]
 
-    return Crew(
+    crew = Crew(
         agents=crew_agents,
         tasks=crew_tasks,
         process=process,
@@ -81,5 +168,12 @@ def build_crew(incident_input: str, tools: dict | None = None) -> Crew:
         memory=use_memory,
         embedder=embedder,
         short_term_memory=short_term_memory,
+        entity_memory=entity_memory,
+        before_kickoff_callbacks=before_kickoff,
+        after_kickoff_callbacks=after_kickoff,
+        step_callback=record_step,
         verbose=True,
     )
+    for router in before_kickoff:
+        router.crew = crew
+    return crew
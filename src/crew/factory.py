@@ -0,0 +1,67 @@
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+from crewai import Agent, Crew
+
+from .agents import build_agent_llms, build_agents
+from .crew import (
+    build_crew,
+    build_embedder_config,
+    build_entity_memory,
+    build_short_term_memory,
+)
+from .settings import get_settings
+from .tools import build_tools
+
+
+class CrewFactory:
+    def __init__(self, tools: dict | None = None, pool_size: int | None = None):
+        self.tools = tools or build_tools()
+        self.llms = build_agent_llms()
+        self.pool_size = pool_size or get_settings().crew_pool_size
+        self._idle: list[dict[str, Agent]] = []
+        self._lock = threading.Lock()
+        self._short_term_memory = None
+        self._entity_memory = None
+
+    def _checkout(self) -> dict[str, Agent]:
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return build_agents(self.tools, llms=self.llms)
+
+    def _release(self, agents: dict[str, Agent]) -> None:
+        with self._lock:
+            if len(self._idle) < self.pool_size:
+                self._idle.append(agents)
+
+    def short_term_memory(self):
+        if not get_settings().memory_enabled:
+            return None
+        with self._lock:
+            if self._short_term_memory is None:
+                self._short_term_memory = build_short_term_memory(build_embedder_config())
+            return self._short_term_memory
+
+    def entity_memory(self):
+        if not get_settings().memory_enabled:
+            return None
+        with self._lock:
+            if self._entity_memory is None:
+                self._entity_memory = build_entity_memory()
+            return self._entity_memory
+
+    @contextmanager
+    def crew(self, incident_input: str) -> Iterator[Crew]:
+        agents = self._checkout()
+        try:
+            yield build_crew(
+                incident_input,
+                agents=agents,
+                manager_llm=self.llms["incident_commander"],
+                short_term_memory=self.short_term_memory(),
+                entity_memory=self.entity_memory(),
+            )
+        finally:
+            self._release(agents)
@@ -0,0 +1,89 @@
+import os
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+
+from .memory import HashingEmbedder, VectorIndex, local_memory_root
+from .settings import get_settings
+
+
+class IncidentIndex:
+    def __init__(self, directory: Path | None = None, embedder: HashingEmbedder | None = None):
+        self.embedder = embedder or HashingEmbedder()
+        directory = directory or local_memory_root() / f"hashed-{self.embedder.dim}" / "incidents"
+        self.index = VectorIndex(directory, self.embedder.dim)
+        self.tables = int(os.getenv("INCIDENT_LSH_TABLES", "12"))
+        self.bits = int(os.getenv("INCIDENT_LSH_BITS", "10"))
+        self.exact_rows = int(os.getenv("INCIDENT_LSH_MIN_ROWS", "2048"))
+        planes = np.random.default_rng(0).standard_normal(
+            (self.tables * self.bits, self.embedder.dim)
+        )
+        self.planes = planes.astype(np.float32)
+        self.weights = 1 << np.arange(self.bits, dtype=np.int64)
+        self.buckets: list[dict[int, list[int]]] = [defaultdict(list) for _ in range(self.tables)]
+        self._hashed = 0
+        self._lock = threading.Lock()
+
+    def signatures(self, vectors: np.ndarray) -> np.ndarray:
+        bits = (vectors @ self.planes.T > 0).reshape(len(vectors), self.tables, self.bits)
+        return bits.astype(np.int64) @ self.weights
+
+    def _sync(self) -> int:
+        self.index.refresh()
+        count = len(self.index)
+        if count > self._hashed:
+            signatures = self.signatures(self.index.vectors(slice(self._hashed, count)))
+            for offset, row in enumerate(signatures):
+                for table, key in enumerate(row):
+                    self.buckets[table][int(key)].append(self._hashed + offset)
+            self._hashed = count
+        return count
+
+    def candidates(self, vector: np.ndarray) -> np.ndarray:
+        keys = self.signatures(vector[None, :])[0]
+        rows: set[int] = set()
+        for table, key in enumerate(keys):
+            for probe in (0, *self.weights):
+                rows.update(self.buckets[table].get(int(key) ^ int(probe), ()))
+        return np.fromiter(sorted(rows), dtype=np.int64, count=len(rows))
+
+    def lookup(self, incident: str, limit: int = 1) -> list[dict]:
+        vector = self.embedder.embed([incident])[0]
+        with self._lock:
+            count = self._sync()
+            if not count:
+                return []
+            rows = np.arange(count) if count <= self.exact_rows else self.candidates(vector)
+            if not len(rows):
+                return []
+            scores = self.index.vectors(rows) @ vector
+        order = np.argsort(-scores)[:limit]
+        matches = []
+        for position in order:
+            record = self.index.records[int(rows[position])]
+            score = float(scores[position])
+            matches.append({"incident": record["text"], "score": score, **record["metadata"]})
+        return matches
+
+    def record(self, incident: str, commander: str, comms: str) -> None:
+        metadata = {"commander": commander, "comms": comms, "created": time.time()}
+        self.index.add(
+            self.embedder.embed([incident]), [{"text": incident, "metadata": metadata}]
+        )
+
+
+_index: IncidentIndex | None = None
+_index_lock = threading.Lock()
+
+
+def get_incident_index() -> IncidentIndex | None:
+    global _index
+    if not get_settings().incident_index:
+        return None
+    with _index_lock:
+        if _index is None:
+            _index = IncidentIndex()
+        return _index
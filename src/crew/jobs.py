@@ -0,0 +1,314 @@
+import importlib
+import json
+import multiprocessing
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+import warnings
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from .settings import get_settings
+
+TERMINAL = {"done", "failed"}
+
+SWEEP_SECONDS = 30.0
+
+
+def build_jobs_path() -> str:
+    root = Path(__file__).resolve().parents[2]
+    return str(root / ".crewai_jobs" / "jobs.sqlite3")
+
+
+class JobStore:
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, handler TEXT, model TEXT, payload TEXT, "
+                "status TEXT, result TEXT, error TEXT, created REAL, started REAL, "
+                "finished REAL, heartbeat REAL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS job_events ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, job_id TEXT, event TEXT)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS job_events_job ON job_events(job_id, seq)")
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs(status, created)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def create(self, handler: str, payload: dict, model: str) -> str:
+        job_id = uuid.uuid4().hex[:12]
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, handler, model, payload, status, created) "
+                "VALUES (?, ?, ?, ?, 'queued', ?)",
+                (job_id, handler, model, json.dumps(payload), time.time()),
+            )
+        return job_id
+
+    def get(self, job_id: str) -> dict | None:
+        row = self._connect().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        return job
+
+    def claim_next(self, limit_for, handlers: tuple[str, ...]) -> dict | None:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            running = dict(
+                conn.execute(
+                    "SELECT model, COUNT(*) FROM jobs WHERE status = 'running' GROUP BY model"
+                ).fetchall()
+            )
+            placeholders = ", ".join("?" * len(handlers))
+            for row in conn.execute(
+                "SELECT id, model FROM jobs WHERE status = 'queued' "
+                f"AND handler IN ({placeholders}) ORDER BY created",
+                handlers,
+            ).fetchall():
+                if running.get(row["model"], 0) >= limit_for(row["model"]):
+                    continue
+                now = time.time()
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', started = ?, heartbeat = ? WHERE id = ?",
+                    (now, now, row["id"]),
+                )
+                conn.execute("COMMIT")
+                return self.get(row["id"])
+            conn.execute("COMMIT")
+            return None
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def requeue_stale(self, stale_seconds: float) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'queued' WHERE status = 'running' AND heartbeat < ?",
+                (time.time() - stale_seconds,),
+            )
+
+    def touch(self, job_ids: list[str]) -> None:
+        with self._connect() as conn:
+            conn.executemany(
+                "UPDATE jobs SET heartbeat = ? WHERE id = ? AND status = 'running'",
+                [(time.time(), job_id) for job_id in job_ids],
+            )
+
+    def release(self, job_id: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'queued' WHERE id = ? AND status = 'running'",
+                (job_id,),
+            )
+
+    def add_events(self, job_id: str, events: list[dict]) -> None:
+        with self._connect() as conn:
+            conn.executemany(
+                "INSERT INTO job_events (job_id, event) VALUES (?, ?)",
+                [(job_id, json.dumps(event, default=str)) for event in events],
+            )
+            conn.execute("UPDATE jobs SET heartbeat = ? WHERE id = ?", (time.time(), job_id))
+
+    def events(self, job_id: str, after: int = 0) -> list[dict]:
+        rows = self._connect().execute(
+            "SELECT seq, event FROM job_events WHERE job_id = ? AND seq > ? ORDER BY seq",
+            (job_id, after),
+        ).fetchall()
+        return [{"seq": row["seq"], **json.loads(row["event"])} for row in rows]
+
+    def finish(self, job_id: str, result: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'done', result = ?, finished = ? WHERE id = ?",
+                (result, time.time(), job_id),
+            )
+
+    def fail(self, job_id: str, error: str) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = ?, finished = ? WHERE id = ?",
+                (error, time.time(), job_id),
+            )
+
+
+class EventWriter:
+    def __init__(self, store: JobStore, job_id: str, flush_seconds: float = 0.25):
+        self.store = store
+        self.job_id = job_id
+        self.flush_seconds = flush_seconds
+        self._buffer: list[dict] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __call__(self, event: dict) -> None:
+        with self._lock:
+            if event["kind"] == "token" and self._buffer and self._buffer[-1]["kind"] == "token":
+                if self._buffer[-1].get("task") == event.get("task"):
+                    self._buffer[-1]["text"] += event.get("text") or ""
+                else:
+                    self._buffer.append(dict(event))
+            else:
+                self._buffer.append(dict(event))
+            if event["kind"] != "token" or time.monotonic() - self._last_flush > self.flush_seconds:
+                self._flush()
+
+    def _flush(self) -> None:
+        if self._buffer:
+            self.store.add_events(self.job_id, self._buffer)
+            self._buffer = []
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+
+
+def resolve_handler(handler: str):
+    module_name, _, function_name = handler.partition(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def execute_job(job_id: str, db_path: str) -> None:
+    from .tracing import start_trace
+
+    store = JobStore(db_path)
+    job = store.get(job_id)
+    writer = EventWriter(store, job_id)
+    try:
+        with start_trace(job["handler"], listeners=[writer]) as trace:
+            result = resolve_handler(job["handler"])(job["payload"])
+        writer({"kind": "trace", "task": None, "trace_id": trace.trace_id, "spans": trace.summary()})
+        writer.close()
+        store.finish(job_id, str(result))
+    except Exception as exc:
+        writer.close()
+        store.fail(job_id, f"{type(exc).__name__}: {exc}")
+
+
+_factory = None
+
+
+def run_incident_job(payload: dict) -> str:
+    global _factory
+    from .factory import CrewFactory
+
+    if _factory is None:
+        _factory = CrewFactory()
+    with _factory.crew(payload["incident"]) as crew:
+        return crew.kickoff().raw
+
+
+def model_limit(model: str) -> int:
+    key = re.sub(r"[^A-Z0-9]+", "_", model.upper()).strip("_")
+    value = os.getenv(f"JOB_MAX_CONCURRENCY_{key}")
+    return int(value) if value else get_settings().job_max_concurrency
+
+
+class JobRunner:
+    def __init__(
+        self, handlers: tuple[str, ...], db_path: str | None = None, workers: int | None = None
+    ):
+        self.handlers = tuple(handlers)
+        self.db_path = db_path or build_jobs_path()
+        self.store = JobStore(self.db_path)
+        settings = get_settings()
+        self.workers = workers or settings.job_workers
+        self.store.requeue_stale(settings.job_stale_seconds)
+        self._pool = self._new_pool()
+        self._active: set[str] = set()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        threading.Thread(target=self._dispatch, name="job-dispatcher", daemon=True).start()
+
+    def submit(self, handler: str, payload: dict, model: str | None = None) -> str:
+        if handler not in self.handlers:
+            raise ValueError(f"Handler {handler} is not registered with this runner.")
+        model = model or get_settings().llm_model or "default"
+        job_id = self.store.create(handler, payload, model)
+        self._wake.set()
+        return job_id
+
+    def get(self, job_id: str) -> dict | None:
+        return self.store.get(job_id)
+
+    def events(self, job_id: str, after: int = 0) -> list[dict]:
+        return self.store.events(job_id, after)
+
+    def _done(self, job_id: str, future: Future) -> None:
+        with self._lock:
+            self._active.discard(job_id)
+        if future.exception() is not None:
+            self.store.fail(job_id, f"Worker crashed: {future.exception()}")
+        self._wake.set()
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    def _sweep(self) -> None:
+        with self._lock:
+            active = list(self._active)
+        if active:
+            self.store.touch(active)
+        stale_seconds = get_settings().job_stale_seconds
+        if stale_seconds:
+            self.store.requeue_stale(stale_seconds)
+
+    def _fill(self) -> None:
+        while True:
+            with self._lock:
+                if len(self._active) >= self.workers:
+                    return
+            job = self.store.claim_next(model_limit, self.handlers)
+            if job is None:
+                return
+            with self._lock:
+                self._active.add(job["id"])
+            try:
+                future = self._pool.submit(execute_job, job["id"], self.db_path)
+            except BaseException:
+                with self._lock:
+                    self._active.discard(job["id"])
+                self.store.release(job["id"])
+                raise
+            future.add_done_callback(lambda f, job_id=job["id"]: self._done(job_id, f))
+
+    def _dispatch(self) -> None:
+        last_sweep = time.monotonic()
+        while True:
+            self._wake.wait(timeout=0.5)
+            self._wake.clear()
+            try:
+                if time.monotonic() - last_sweep >= SWEEP_SECONDS:
+                    last_sweep = time.monotonic()
+                    self._sweep()
+                self._fill()
+            except BrokenProcessPool:
+                warnings.warn("Job worker pool broke, starting a new one.", RuntimeWarning)
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = self._new_pool()
+                self._wake.set()
+            except Exception as exc:
+                warnings.warn(f"Job dispatcher error: {exc}", RuntimeWarning)
+                time.sleep(1)
@@ -0,0 +1,155 @@
+import threading
+
+from crewai import LLM
+
+from .cache import CACHE_PARAMS, cache_key, get_response_cache
+from .ratelimit import backoff_delay, estimate_tokens, governor_for
+from .settings import get_settings
+from .tracing import current_span, emit, span
+
+_stream_forwarding = False
+_stream_lock = threading.Lock()
+
+# USD per million input/output tokens; first matching substring wins.
+MODEL_PRICES = (
+    ("gpt-4o-mini", 0.15, 0.60),
+    ("gpt-4o", 2.50, 10.00),
+    ("flash-lite", 0.075, 0.30),
+    ("gemini-1.5-flash", 0.075, 0.30),
+    ("gemini-2.0-flash", 0.10, 0.40),
+    ("gemini-1.5-pro", 1.25, 5.00),
+    ("gemini-2.5-pro", 1.25, 10.00),
+)
+
+
+def model_cost(model: str, tokens_in: int, tokens_out: int) -> float | None:
+    for name, input_price, output_price in MODEL_PRICES:
+        if name in model:
+            return (tokens_in * input_price + tokens_out * output_price) / 1e6
+    return None
+
+
+class ManagedLLM(LLM):
+    def __init__(
+        self,
+        model: str,
+        lane: str = "specialist",
+        tier: str = "strong",
+        escalate_to: LLM | None = None,
+        **kwargs,
+    ):
+        super().__init__(model=model, **kwargs)
+        self.lane = lane
+        self.tier = tier
+        self.escalate_to = escalate_to
+        self.governor = governor_for(model)
+        self.max_retries = get_settings().llm_max_retries
+
+    def cache_params(self) -> dict:
+        return {name: getattr(self, name, None) for name in CACHE_PARAMS}
+
+    def call(self, messages, *args, **kwargs):
+        with span(
+            f"llm:{self.model}",
+            kind="llm",
+            model=self.model,
+            lane=self.lane,
+            tier=self.tier,
+            tokens_in=estimate_tokens(messages),
+        ) as current:
+            cache = get_response_cache()
+            key = None
+            tools = kwargs.get("tools", args[0] if args else None)
+            if cache is not None and not tools:
+                key = cache_key(self.model, messages, self.cache_params())
+                cached = cache.get(key)
+                if cached is not None:
+                    current.set(cache_hit=True, tokens_out=estimate_tokens(cached))
+                    return cached
+            response = self._call_with_retries(messages, *args, **kwargs)
+            if key is not None and isinstance(response, str):
+                cache.put(key, self.model, response)
+            tokens_out = estimate_tokens(str(response))
+            current.set(
+                cache_hit=False,
+                tokens_out=tokens_out,
+                cost_usd=model_cost(self.model, estimate_tokens(messages), tokens_out),
+            )
+            return response
+
+    def _call_with_retries(self, messages, *args, **kwargs):
+        tokens = estimate_tokens(messages)
+        attempt = 0
+        while True:
+            waited = self.governor.acquire(tokens=tokens, lane=self.lane)
+            current_span().add("rate_wait_ms", waited * 1000)
+            try:
+                return super().call(messages, *args, **kwargs)
+            except Exception as exc:
+                delay = backoff_delay(exc, attempt)
+                if delay is None or attempt >= self.max_retries:
+                    raise
+                self.governor.penalize(delay)
+                current_span().add("retries", 1)
+                attempt += 1
+
+
+def forward_stream_chunks() -> None:
+    global _stream_forwarding
+    with _stream_lock:
+        if _stream_forwarding:
+            return
+        try:
+            from crewai.events import LLMStreamChunkEvent, crewai_event_bus
+        except ImportError:
+            try:
+                from crewai.utilities.events import crewai_event_bus
+                from crewai.utilities.events.llm_events import LLMStreamChunkEvent
+            except ImportError:
+                return
+
+        @crewai_event_bus.on(LLMStreamChunkEvent)
+        def on_chunk(source, event) -> None:
+            emit("token", text=event.chunk)
+
+        _stream_forwarding = True
+
+
+def default_model() -> str | None:
+    settings = get_settings()
+    if settings.llm_model:
+        return settings.llm_model
+    if settings.google_key:
+        return "gemini/gemini-1.5-flash"
+    if settings.openai_api_key:
+        return settings.openai_model
+    return None
+
+
+def build_llm(lane: str = "specialist", tier: str = "strong") -> LLM | None:
+    settings = get_settings()
+    kwargs = {}
+    if lane == "synthesis" and settings.stream_synthesis:
+        forward_stream_chunks()
+        kwargs["stream"] = True
+    strong = _build_llm(default_model(), lane, "strong", **kwargs)
+    if tier == "strong" or strong is None or settings.llm_fast_model in (None, strong.model):
+        return strong
+    escalate_to = strong if settings.llm_cascade else None
+    fast = _build_llm(settings.llm_fast_model, lane, "fast", escalate_to=escalate_to, **kwargs)
+    return fast or strong
+
+
+def _build_llm(model: str | None, lane: str, tier: str, **kwargs) -> LLM | None:
+    settings = get_settings()
+    if not model:
+        return None
+    if "gemini" in model and not settings.google_key:
+        return None
+    if "gpt" in model and not settings.openai_api_key:
+        return None
+    try:
+        return ManagedLLM(model=model, lane=lane, tier=tier, **kwargs)
+    except ImportError:
+        return None
+
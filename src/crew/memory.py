@@ -0,0 +1,240 @@
+import atexit
+import hashlib
+import json
+import math
+import re
+import threading
+import warnings
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from .settings import get_settings
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has in is it of on or the to was were with".split()
+)
+
+
+def memory_embedder() -> str:
+    settings = get_settings()
+    default = "google" if settings.google_api_key else "local"
+    return (settings.memory_embedder or default).lower()
+
+
+def local_memory_root() -> Path:
+    root = Path(__file__).resolve().parents[2]
+    return Path(get_settings().memory_dir or root / ".crewai_memory") / "local"
+
+
+class HashingEmbedder:
+    def __init__(self, dim: int | None = None):
+        self.dim = dim or get_settings().memory_embed_dim
+
+    def features(self, text: str) -> Counter:
+        tokens = [token for token in _TOKEN.findall(text.lower()) if token not in STOPWORDS]
+        return Counter(tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])])
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature, count in self.features(text).items():
+                digest = int.from_bytes(
+                    hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "big"
+                )
+                sign = 1.0 if digest >> 63 else -1.0
+                vectors[row, digest % self.dim] += sign * (1.0 + math.log(count))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+class VectorIndex:
+    def __init__(self, directory: Path, dim: int, block_rows: int | None = None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.dim = dim
+        settings = get_settings()
+        self.block_rows = block_rows or settings.memory_scan_block
+        self.scan_limit = settings.memory_scan_limit
+        self._truncation_warned = False
+        self.vectors_path = self.directory / "vectors.f32"
+        self.meta_path = self.directory / "meta.jsonl"
+        self.lock_path = self.directory / ".lock"
+        self.meta_path.touch(exist_ok=True)
+        self.vectors_path.touch(exist_ok=True)
+        self.records: list[dict] = []
+        self._meta_offset = 0
+        self._vectors: np.memmap | None = None
+        self._lock = threading.RLock()
+        self.refresh()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def _file_lock(self):
+        handle = open(self.lock_path, "a")
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        return handle
+
+    def _capacity(self) -> int:
+        return self.vectors_path.stat().st_size // (self.dim * 4)
+
+    def _map(self) -> np.memmap | None:
+        capacity = self._capacity()
+        if capacity == 0:
+            return None
+        if self._vectors is None or self._vectors.shape[0] != capacity:
+            self._vectors = np.memmap(
+                self.vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim)
+            )
+        return self._vectors
+
+    def refresh(self) -> None:
+        with self._lock, open(self.meta_path, "rb") as f:
+            f.seek(self._meta_offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                self.records.append(json.loads(line))
+                self._meta_offset += len(line)
+
+    def add(self, vectors: np.ndarray, records: list[dict]) -> None:
+        if not records:
+            return
+        with self._lock, self._file_lock():
+            self.refresh()
+            start = len(self.records)
+            needed = start + len(records)
+            if needed > self._capacity():
+                capacity = max(needed, self._capacity() * 2, 1024)
+                self._vectors = None
+                with open(self.vectors_path, "r+b") as f:
+                    f.truncate(capacity * self.dim * 4)
+            mapped = self._map()
+            mapped[start:needed] = vectors
+            mapped.flush()
+            with open(self.meta_path, "a", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record, default=str) + "\n")
+            self.refresh()
+
+    def vectors(self, rows) -> np.ndarray:
+        with self._lock:
+            mapped = self._map()
+            if mapped is None:
+                return np.zeros((0, self.dim), dtype=np.float32)
+            return np.asarray(mapped[rows])
+
+    def search(
+        self, vector: np.ndarray, limit: int, threshold: float = 0.0
+    ) -> list[tuple[int, float]]:
+        with self._lock:
+            self.refresh()
+            count = len(self.records)
+            mapped = self._map()
+            if not count or mapped is None:
+                return []
+            first = max(0, count - self.scan_limit) if self.scan_limit else 0
+            if first and not self._truncation_warned:
+                self._truncation_warned = True
+                warnings.warn(
+                    f"Memory index has {count} entries; searching only the newest "
+                    f"{self.scan_limit}. Raise MEMORY_SCAN_LIMIT (0 = no limit) to search all.",
+                    RuntimeWarning,
+                )
+            best: list[tuple[int, float]] = []
+            for start in range(first, count, self.block_rows):
+                stop = min(count, start + self.block_rows)
+                scores = mapped[start:stop] @ vector
+                top = np.argpartition(-scores, min(limit, len(scores) - 1))[:limit]
+                best.extend((start + int(i), float(scores[i])) for i in top)
+                best = sorted(best, key=lambda item: item[1], reverse=True)[:limit]
+            return [(row, score) for row, score in best if score >= threshold]
+
+    def reset(self) -> None:
+        with self._lock, self._file_lock():
+            self._vectors = None
+            for path in (self.vectors_path, self.meta_path):
+                path.write_bytes(b"")
+            self.records = []
+            self._meta_offset = 0
+
+
+class LocalMemoryStorage:
+    def __init__(self, directory: Path, embedder: HashingEmbedder | None = None):
+        self.embedder = embedder or HashingEmbedder()
+        self.index = VectorIndex(directory, self.embedder.dim)
+        settings = get_settings()
+        self.batch_size = settings.memory_batch_size
+        self.min_score = settings.memory_min_score
+        self._pending: list[tuple[str, dict]] = []
+        self._lock = threading.Lock()
+
+    def save(self, value, metadata: dict | None = None) -> None:
+        with self._lock:
+            self._pending.append((str(value), metadata or {}))
+            if len(self._pending) >= self.batch_size:
+                self._flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        texts = [text for text, _ in self._pending]
+        records = [{"text": text, "metadata": metadata} for text, metadata in self._pending]
+        self.index.add(self.embedder.embed(texts), records)
+        self._pending = []
+
+    def search(
+        self,
+        query: str,
+        limit: int = 3,
+        filter: dict | None = None,
+        score_threshold: float | None = None,
+    ) -> list[dict]:
+        self.flush()
+        vector = self.embedder.embed([query])[0]
+        fetch = limit * 4 if filter else limit
+        threshold = self.min_score if score_threshold is None else score_threshold
+        results = []
+        for row, score in self.index.search(vector, fetch, threshold):
+            record = self.index.records[row]
+            metadata = record.get("metadata") or {}
+            if filter and any(metadata.get(k) != v for k, v in filter.items()):
+                continue
+            results.append(
+                {"id": row, "context": record["text"], "metadata": metadata, "score": score}
+            )
+        return results[:limit]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._pending = []
+            self.index.reset()
+
+
+_storages: dict[str, LocalMemoryStorage] = {}
+_storages_lock = threading.Lock()
+
+
+def get_local_storage(kind: str) -> LocalMemoryStorage:
+    embedder = HashingEmbedder()
+    directory = local_memory_root() / f"hashed-{embedder.dim}" / kind
+    with _storages_lock:
+        storage = _storages.get(str(directory))
+        if storage is None:
+            storage = _storages[str(directory)] = LocalMemoryStorage(directory, embedder)
+            atexit.register(storage.flush)
+        return storage
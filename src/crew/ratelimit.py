@@ -0,0 +1,168 @@
+import hashlib
+import heapq
+import itertools
+import re
+import threading
+import time
+
+from .settings import get_settings
+
+LANES = {"synthesis": 0, "specialist": 1}
+
+_RATE_LIMIT_MESSAGE = re.compile(
+    r"(?<![\w.])429(?![\w.])|rate[ _-]?limit|too many requests|RESOURCE_EXHAUSTED",
+    re.IGNORECASE,
+)
+
+_RETRY_AFTER_PATTERNS = (
+    re.compile(r"retry[ -]?after[\"':= ]+(\d+(?:\.\d+)?)", re.IGNORECASE),
+    re.compile(r"retryDelay[\"':= ]+(\d+(?:\.\d+)?)s", re.IGNORECASE),
+    re.compile(r"retry in (\d+(?:\.\d+)?)\s*s", re.IGNORECASE),
+)
+
+
+class TokenBucket:
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+    def take(self, amount: float) -> None:
+        self.level -= min(amount, self.capacity)
+
+
+class RateGovernor:
+    def __init__(self, rpm: float | None = None, tpm: float | None = None):
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.blocked_until = 0.0
+        self.stats = {"acquired": 0, "waited_seconds": 0.0, "rate_limited": 0}
+        self._cond = threading.Condition()
+        self._waiters: list[tuple[int, int]] = []
+        self._seq = itertools.count()
+
+    def _wait_time(self, tokens: int, now: float) -> float:
+        wait = max(0.0, self.blocked_until - now)
+        for bucket, amount in ((self.requests, 1), (self.tokens, tokens)):
+            if bucket:
+                bucket.refill(now)
+                wait = max(wait, bucket.wait_time(amount))
+        return wait
+
+    def acquire(self, tokens: int = 0, lane: str = "specialist") -> float:
+        entry = (LANES.get(lane, LANES["specialist"]), next(self._seq))
+        started = time.monotonic()
+        with self._cond:
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    now = time.monotonic()
+                    timeout = None
+                    if self._waiters[0] == entry:
+                        timeout = self._wait_time(tokens, now)
+                        if timeout <= 0:
+                            if self.requests:
+                                self.requests.take(1)
+                            if self.tokens:
+                                self.tokens.take(tokens)
+                            break
+                    self._cond.wait(timeout=timeout)
+            finally:
+                self._waiters.remove(entry)
+                heapq.heapify(self._waiters)
+                self._cond.notify_all()
+            waited = time.monotonic() - started
+            self.stats["acquired"] += 1
+            self.stats["waited_seconds"] += waited
+        return waited
+
+    def penalize(self, delay: float) -> None:
+        with self._cond:
+            self.stats["rate_limited"] += 1
+            self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+            if self.requests:
+                self.requests.level = min(self.requests.level, 0.0)
+            self._cond.notify_all()
+
+
+_governors: dict[str, RateGovernor] = {}
+_governors_lock = threading.Lock()
+
+
+def provider_api_key(model: str) -> str:
+    settings = get_settings()
+    if "gemini" in model:
+        return settings.google_key or model
+    if "gpt" in model or model.startswith("openai/"):
+        return settings.openai_api_key or model
+    return model
+
+
+def governor_for(model: str) -> RateGovernor:
+    key = hashlib.sha256(provider_api_key(model).encode("utf-8")).hexdigest()[:16]
+    with _governors_lock:
+        governor = _governors.get(key)
+        if governor is None:
+            settings = get_settings()
+            governor = RateGovernor(rpm=settings.agent_max_rpm, tpm=settings.llm_max_tpm)
+            _governors[key] = governor
+        return governor
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    response = getattr(exc, "response", None)
+    if 429 in (getattr(exc, "status_code", None), getattr(response, "status_code", None)):
+        return True
+    if type(exc).__name__ == "RateLimitError":
+        return True
+    return bool(_RATE_LIMIT_MESSAGE.search(str(exc)))
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or getattr(exc, "headers", None) or {}
+    try:
+        value = headers.get("retry-after") or headers.get("Retry-After")
+    except AttributeError:
+        value = None
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    message = str(exc)
+    for pattern in _RETRY_AFTER_PATTERNS:
+        match = pattern.search(message)
+        if match:
+            return float(match.group(1))
+    return None
+
+
+def backoff_delay(exc: BaseException, attempt: int) -> float | None:
+    if not is_rate_limit_error(exc):
+        return None
+    hinted = retry_after_seconds(exc)
+    if hinted is not None:
+        return hinted
+    return min(60.0, 2.0 * (2**attempt))
+
+
+def estimate_tokens(messages) -> int:
+    if isinstance(messages, str):
+        return max(1, len(messages) // 4)
+    total = 0
+    for message in messages or []:
+        content = message.get("content") if isinstance(message, dict) else message
+        total += len(str(content or "")) // 4
+    return max(1, total)
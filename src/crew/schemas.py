@@ -0,0 +1,71 @@
+import json
+from typing import Literal
+
+from pydantic import BaseModel, Field, ValidationError
+
+
+class Action(BaseModel):
+    action: str
+    owner: str
+
+
+class TriageReport(BaseModel):
+    root_cause: str = Field(description="Most likely root cause hypothesis")
+    evidence: list[str] = Field(default_factory=list)
+    mitigations: list[str] = Field(default_factory=list, description="Immediate steps")
+    classification: Literal["deploy", "db", "security", "unknown"] = "unknown"
+    confidence: float = Field(default=0.0, ge=0.0, le=1.0)
+
+
+class SpecialistReport(BaseModel):
+    findings: list[str] = Field(default_factory=list)
+    risk: Literal["low", "medium", "high"] = "medium"
+    recommendations: list[str] = Field(default_factory=list)
+
+
+class CommanderDecision(BaseModel):
+    severity: Literal["SEV1", "SEV2", "SEV3", "SEV4"]
+    root_cause: str
+    actions: list[Action] = Field(default_factory=list)
+    summary: str = ""
+
+
+class StatusUpdate(BaseModel):
+    status: Literal["investigating", "identified", "monitoring", "resolved"]
+    headline: str
+    update: str
+    next_update_minutes: int = 30
+    postmortem_outline: list[str] = Field(default_factory=list)
+
+
+class KeyPoints(BaseModel):
+    points: list[str] = Field(default_factory=list)
+
+
+class DocumentSummary(BaseModel):
+    title: str = ""
+    summary: str
+    key_points: list[str] = Field(default_factory=list)
+
+
+TASK_OUTPUTS: dict[str, type[BaseModel]] = {
+    "triage": TriageReport,
+    "app_check": SpecialistReport,
+    "db_check": SpecialistReport,
+    "security_check": SpecialistReport,
+    "commander": CommanderDecision,
+    "comms": StatusUpdate,
+}
+
+
+def compact_json(model: BaseModel) -> str:
+    data = model.model_dump(mode="json", exclude_none=True)
+    data = {key: value for key, value in data.items() if value not in ("", [])}
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def parse_output(text: str, model: type[BaseModel]) -> BaseModel | None:
+    try:
+        return model.model_validate_json(text)
+    except ValidationError:
+        return None
@@ -0,0 +1,209 @@
+import math
+import os
+import threading
+import warnings
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import get_args
+
+ROOT = Path(__file__).resolve().parents[2]
+
+_TRUE = {"1", "true", "yes", "y"}
+_FALSE = {"0", "false", "no", "n"}
+
+
+class SettingsError(ValueError):
+    pass
+
+
+def _setting(
+    name: str,
+    default,
+    minimum: float | None = None,
+    maximum: float | None = None,
+    secret: bool = False,
+):
+    return field(
+        default=default,
+        repr=not secret,
+        metadata={"env": name, "minimum": minimum, "maximum": maximum},
+    )
+
+
+@dataclass(frozen=True)
+class Settings:
+    llm_model: str | None = _setting("LLM_MODEL", None)
+    openai_model: str = _setting("OPENAI_MODEL", "gpt-4o-mini")
+    llm_fast_model: str | None = _setting("LLM_FAST_MODEL", None)
+    llm_cascade: bool = _setting("LLM_CASCADE", True)
+    google_api_key: str | None = _setting("GOOGLE_API_KEY", None, secret=True)
+    gemini_api_key: str | None = _setting("GEMINI_API_KEY", None, secret=True)
+    openai_api_key: str | None = _setting("OPENAI_API_KEY", None, secret=True)
+
+    safe_mode: bool = _setting("SAFE_MODE", False)
+    survival_mode: bool = _setting("SURVIVAL_MODE", False)
+    parallel_mode: bool = _setting("PARALLEL_MODE", False)
+    adaptive_mode: bool = _setting("ADAPTIVE_MODE", False)
+    llm_manager: bool = _setting("LLM_MANAGER", False)
+    adaptive_confidence: float = _setting("ADAPTIVE_CONFIDENCE", 0.7, minimum=0.0, maximum=1.0)
+    structured_outputs: bool = _setting("STRUCTURED_OUTPUTS", True)
+    stream_synthesis: bool = _setting("STREAM_SYNTHESIS", True)
+    tracing: bool = _setting("TRACING", True)
+
+    memory_enabled: bool = _setting("MEMORY_ENABLED", True)
+    memory_embedder: str | None = _setting("MEMORY_EMBEDDER", None)
+    memory_dir: str | None = _setting("MEMORY_DIR", None)
+    memory_embed_dim: int = _setting("MEMORY_EMBED_DIM", 512, minimum=1)
+    memory_batch_size: int = _setting("MEMORY_BATCH_SIZE", 16, minimum=1)
+    memory_min_score: float = _setting("MEMORY_MIN_SCORE", 0.15, minimum=0.0, maximum=1.0)
+    memory_scan_block: int = _setting("MEMORY_SCAN_BLOCK", 8192, minimum=1)
+    memory_scan_limit: int = _setting("MEMORY_SCAN_LIMIT", 100000, minimum=0)
+    incident_index: bool = _setting("INCIDENT_INDEX", False)
+    incident_seed_score: float = _setting("INCIDENT_SEED_SCORE", 0.6, minimum=0.0, maximum=1.0)
+    incident_known_score: float = _setting("INCIDENT_KNOWN_SCORE", 0.9, minimum=0.0, maximum=1.0)
+
+    agent_max_rpm: int | None = _setting("AGENT_MAX_RPM", None, minimum=1)
+    llm_max_tpm: int | None = _setting("LLM_MAX_TPM", None, minimum=1)
+    llm_max_retries: int = _setting("LLM_MAX_RETRIES", 5, minimum=0)
+
+    parallel_max_workers: int | None = _setting("PARALLEL_MAX_WORKERS", None, minimum=1)
+    crew_pool_size: int = _setting("CREW_POOL_SIZE", 4, minimum=1)
+    batch_concurrency: int = _setting("BATCH_CONCURRENCY", 2, minimum=1)
+    job_workers: int = _setting("JOB_WORKERS", 2, minimum=1)
+    job_max_concurrency: int = _setting("JOB_MAX_CONCURRENCY", 2, minimum=1)
+    pdf_map_workers: int = _setting("PDF_MAP_WORKERS", 4, minimum=1)
+
+    llm_cache: bool = _setting("LLM_CACHE", True)
+    llm_cache_max_entries: int = _setting("LLM_CACHE_MAX_ENTRIES", 5000, minimum=1)
+    llm_cache_ttl: float = _setting("LLM_CACHE_TTL", 86400.0, minimum=0.0)
+    tool_cache: bool = _setting("TOOL_CACHE", True)
+    tool_cache_max_entries: int = _setting("TOOL_CACHE_MAX_ENTRIES", 512, minimum=1)
+    context_view_tokens: int = _setting("CONTEXT_VIEW_TOKENS", 400, minimum=1)
+    context_findings_tokens: int = _setting("CONTEXT_FINDINGS_TOKENS", 250, minimum=1)
+
+    log_dir: str | None = _setting("LOG_DIR", None)
+    log_window_minutes: float = _setting("LOG_WINDOW_MINUTES", 30.0, minimum=0.0)
+    log_glob: str = _setting("LOG_GLOB", "*.log*")
+    log_index_block: int = _setting("LOG_INDEX_BLOCK", 65536, minimum=256)
+    log_index_bloom_bits: int = _setting("LOG_INDEX_BLOOM_BITS", 4096, minimum=64)
+    log_max_signatures: int = _setting("LOG_MAX_SIGNATURES", 8, minimum=1)
+    metrics_dir: str | None = _setting("METRICS_DIR", None)
+    metrics_recent_points: int = _setting("METRICS_RECENT_POINTS", 12, minimum=1)
+    metrics_baseline_points: int = _setting("METRICS_BASELINE_POINTS", 48, minimum=0)
+    metrics_top_anomalies: int = _setting("METRICS_TOP_ANOMALIES", 8, minimum=1)
+    anomaly_min_score: float = _setting("ANOMALY_MIN_SCORE", 4.0, minimum=0.0)
+    slow_query_log: str | None = _setting("SLOW_QUERY_LOG", None)
+    slow_query_max_fingerprints: int = _setting("SLOW_QUERY_MAX_FINGERPRINTS", 5000, minimum=1)
+    slow_query_max_bytes: int = _setting("SLOW_QUERY_MAX_BYTES", 64 << 20, minimum=1)
+    slow_query_batch: int = _setting("SLOW_QUERY_BATCH", 10000, minimum=1)
+    slow_query_top: int = _setting("SLOW_QUERY_TOP", 8, minimum=1)
+
+    tool_http_max_connections: int = _setting("TOOL_HTTP_MAX_CONNECTIONS", 20, minimum=1)
+    job_stale_seconds: float = _setting("JOB_STALE_SECONDS", 600.0, minimum=0.0)
+    job_poll_seconds: float = _setting("JOB_POLL_SECONDS", 1.0, minimum=0.0)
+
+    @property
+    def google_key(self) -> str | None:
+        return self.google_api_key or self.gemini_api_key
+
+    @classmethod
+    def from_env(cls, env) -> "Settings":
+        values = {}
+        errors = []
+        for spec in fields(cls):
+            name = spec.metadata["env"]
+            raw = (env.get(name) or "").strip()
+            if not raw:
+                continue
+            kind = next((arg for arg in get_args(spec.type) if arg is not type(None)), spec.type)
+            try:
+                if kind is bool:
+                    if raw.lower() not in _TRUE | _FALSE:
+                        raise ValueError
+                    value = raw.lower() in _TRUE
+                else:
+                    value = kind(raw)
+            except ValueError:
+                errors.append(f"{name}={raw!r} is not a valid {kind.__name__}")
+                continue
+            if kind is float and not math.isfinite(value):
+                errors.append(f"{name}={raw!r} must be a finite number")
+                continue
+            minimum, maximum = spec.metadata["minimum"], spec.metadata["maximum"]
+            if minimum is not None and value < minimum:
+                errors.append(f"{name}={raw!r} must be at least {minimum}")
+                continue
+            if maximum is not None and value > maximum:
+                errors.append(f"{name}={raw!r} must be at most {maximum}")
+                continue
+            values[spec.name] = value
+        if errors:
+            raise SettingsError("; ".join(errors))
+        return cls(**values)
+
+
+_lock = threading.Lock()
+_settings: Settings | None = None
+_env_mtime: float | None = None
+_env_keys: set[str] = set()
+_overrides: dict[str, str] = {}
+
+
+def env_file_path() -> Path | None:
+    path = os.getenv("ENV_FILE", str(ROOT / ".env"))
+    return Path(path) if path else None
+
+
+def _mtime(path: Path | None) -> float | None:
+    try:
+        return path.stat().st_mtime if path else None
+    except FileNotFoundError:
+        return None
+
+
+def read_env_file(path: Path) -> dict[str, str]:
+    values = {}
+    for line in path.read_text(encoding="utf-8").splitlines():
+        line = line.strip()
+        if not line or line.startswith("#") or "=" not in line:
+            continue
+        key, value = line.split("=", 1)
+        values[key.strip()] = value.strip().strip('"')
+    return values
+
+
+def load_env() -> None:
+    global _env_mtime, _env_keys
+    path = env_file_path()
+    mtime = _mtime(path)
+    values = read_env_file(path) if mtime is not None else {}
+    for key in _env_keys - values.keys():
+        os.environ.pop(key, None)
+    os.environ.update(values)
+    os.environ.update(_overrides)
+    _env_keys = set(values)
+    _env_mtime = mtime
+
+
+def get_settings() -> Settings:
+    global _settings
+    with _lock:
+        if _settings is not None and _mtime(env_file_path()) == _env_mtime:
+            return _settings
+        load_env()
+        try:
+            _settings = Settings.from_env(os.environ)
+        except SettingsError as exc:
+            if _settings is None:
+                raise
+            warnings.warn(f"Keeping previous settings, .env is invalid: {exc}", RuntimeWarning)
+        return _settings
+
+
+def override_settings(**values: str) -> Settings:
+    global _settings
+    with _lock:
+        _overrides.update(values)
+        os.environ.update(values)
+        _settings = Settings.from_env(os.environ)
+        return _settings
@@ -1,61 +1,158 @@
+from typing import Callable
+
 from crewai import Task
+from pydantic import Field
+
+from .context import IncidentContext, compress_findings
+from .schemas import TASK_OUTPUTS, CommanderDecision, compact_json, parse_output
+from .settings import get_settings
+from .tracing import emit, span
+
+
+class TracedTask(Task):
+    output_filter: Callable[[str], str] | None = Field(default=None, exclude=True)
+
+    def needs_escalation(self, output) -> bool:
+        if self.output_pydantic is not None and output.pydantic is None:
+            return True
+        return not (output.raw or "").strip()
 
+    def execute_sync(self, agent=None, context=None, tools=None):
+        agent = agent or self.agent
+        role = getattr(agent, "role", None)
+        name = f"task:{self.name or role}"
+        with span(name, kind="task", agent=role, task=self.name) as current:
+            emit("task_started", agent=role)
+            output = super().execute_sync(agent=agent, context=context, tools=tools)
+            fallback = getattr(getattr(agent, "llm", None), "escalate_to", None)
+            if fallback is not None and self.needs_escalation(output):
+                current.set(escalated=True)
+                emit("task_escalated", agent=role, model=fallback.model)
+                fast, agent.llm = agent.llm, fallback
+                try:
+                    output = super().execute_sync(agent=agent, context=context, tools=tools)
+                finally:
+                    agent.llm = fast
+            data = None
+            if output.pydantic is not None:
+                output.raw = compact_json(output.pydantic)
+                data = output.pydantic.model_dump()
+            elif self.output_filter and output.raw:
+                output.raw = self.output_filter(output.raw)
+            current.set(tokens_out=len(output.raw or "") // 4)
+            emit("task_completed", agent=role, output=output.raw, data=data)
+            return output
 
-def build_tasks(agents: dict, incident_input: str) -> dict[str, Task]:
-    triage = Task(
+
+def build_tasks(
+    agents: dict,
+    incident_input: str,
+    context: IncidentContext | None = None,
+    prior: dict | None = None,
+    known_issue: bool = False,
+) -> dict[str, TracedTask]:
+    context = context or IncidentContext(incident_input)
+    specialist_findings = context.findings_filter()
+    structured = get_settings().structured_outputs
+    outputs = TASK_OUTPUTS if structured else {}
+    prior_note = ""
+    if prior:
+        decision = parse_output(prior["commander"], CommanderDecision)
+        resolution = (
+            compact_json(decision)
+            if decision
+            else compress_findings(prior["commander"], context.findings_tokens)
+        )
+        prior_note = (
+            f"\n\nSimilar past incident (similarity {prior['score']:.2f}): {prior['incident']}\n"
+            f"Prior resolution:\n{resolution}"
+        )
+
+    classification_hint = (
+        ""
+        if structured
+        else " End with one line in the form "
+        "'Classification: <deploy|db|security|unknown> (confidence <0.0-1.0>)'."
+    )
+
+    triage = TracedTask(
+        name="triage",
         description=(
             "Triage the incident using available signals. Identify likely root cause "
-            "and immediate stabilizing actions.\n\n"
-            f"Incident: {incident_input}"
+            "and immediate stabilizing actions, and classify it as deploy, db, security "
+            f"or unknown with a confidence between 0 and 1.{classification_hint}\n\n"
+            f"Incident: {context.view('sre_triage')}{prior_note}"
         ),
         agent=agents["sre_triage"],
-        expected_output="Root cause hypothesis + immediate mitigation steps.",
+        expected_output="Root cause hypothesis + immediate mitigation steps + classification.",
+        output_pydantic=outputs.get("triage"),
+        output_filter=specialist_findings,
     )
 
-    app_check = Task(
+    app_check = TracedTask(
+        name="app_check",
         description=(
             "Inspect recent deploys/config changes and identify risky diffs or rollbacks.\n\n"
-            f"Incident: {incident_input}"
+            f"Incident: {context.view('app_engineer')}"
         ),
         agent=agents["app_engineer"],
         expected_output="Suspicious deploy/config changes and rollback options.",
+        output_pydantic=outputs.get("app_check"),
+        output_filter=specialist_findings,
     )
 
-    db_check = Task(
+    db_check = TracedTask(
+        name="db_check",
         description=(
             "Analyze DB performance signals and query hotspots; propose fixes.\n\n"
-            f"Incident: {incident_input}"
+            f"Incident: {context.view('database_specialist')}"
         ),
         agent=agents["database_specialist"],
         expected_output="DB bottlenecks + concrete remediation steps.",
+        output_pydantic=outputs.get("db_check"),
+        output_filter=specialist_findings,
     )
 
-    security_check = Task(
+    security_check = TracedTask(
+        name="security_check",
         description=(
             "Assess security alerts or indicators of compromise; propose containment.\n\n"
-            f"Incident: {incident_input}"
+            f"Incident: {context.view('security_analyst')}"
         ),
         agent=agents["security_analyst"],
         expected_output="Security risk assessment + containment actions.",
+        output_pydantic=outputs.get("security_check"),
+        output_filter=specialist_findings,
     )
 
-    commander = Task(
+    commander_action = (
+        "This matches a known issue. Confirm the prior resolution still applies, adapt it, "
+        "set severity, and assign owners."
+        if known_issue
+        else "Combine findings, set severity, decide on action plan, and assign owners."
+    )
+    commander = TracedTask(
+        name="commander",
         description=(
-            "Combine findings, set severity, decide on action plan, and assign owners.\n\n"
-            f"Incident: {incident_input}"
+            f"{commander_action}\n\n"
+            f"Incident: {context.view('incident_commander')}{prior_note}"
         ),
         agent=agents["incident_commander"],
         expected_output="Severity level, action plan, and owner assignments.",
-        context=[triage, app_check, db_check, security_check],
+        output_pydantic=outputs.get("commander"),
+        context=[] if known_issue else [triage, app_check, db_check, security_check],
+        output_filter=context.findings_filter(scale=2.0),
     )
 
-    comms = Task(
+    comms = TracedTask(
+        name="comms",
         description=(
             "Draft stakeholder update and post-incident summary outline.\n\n"
-            f"Incident: {incident_input}"
+            f"Incident: {context.view('comms_lead')}"
         ),
         agent=agents["comms_lead"],
         expected_output="Status update + post-incident summary outline.",
+        output_pydantic=outputs.get("comms"),
         context=[commander],
     )
 
@@ -0,0 +1,123 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from crewai.tools import BaseTool
+from pydantic import ConfigDict
+
+from .settings import get_settings
+from .tracing import span
+
+DEFAULT_TTLS = {
+    "metrics": 15.0,
+    "logs": 30.0,
+    "db_metrics": 15.0,
+    "query_analyzer": 60.0,
+    "siem": 30.0,
+    "threat_intel": 300.0,
+    "deploy_history": 300.0,
+    "config_repo": 300.0,
+}
+
+WRITE_TOOLS = {"incident_tracker", "status_page"}
+
+def normalize_query(*args, **kwargs) -> str:
+    values = [str(value) for value in args]
+    values += [f"{key}={value}" for key, value in sorted(kwargs.items())]
+    return " ".join(" ".join(values).lower().split())
+
+
+class ToolResultCache:
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], tuple[float, str]] = OrderedDict()
+        self._stats: dict[str, dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def _count(self, tool: str, outcome: str) -> None:
+        counters = self._stats.setdefault(tool, {"hits": 0, "misses": 0})
+        counters[outcome] += 1
+
+    def get(self, tool: str, key: str) -> str | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get((tool, key))
+            if entry is None or entry[0] < now:
+                if entry is not None:
+                    del self._entries[(tool, key)]
+                self._count(tool, "misses")
+                return None
+            self._entries.move_to_end((tool, key))
+            self._count(tool, "hits")
+            return entry[1]
+
+    def put(self, tool: str, key: str, value: str, ttl: float) -> None:
+        with self._lock:
+            self._entries[(tool, key)] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end((tool, key))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, dict]:
+        with self._lock:
+            return {
+                tool: {
+                    **counters,
+                    "hit_rate": counters["hits"] / (counters["hits"] + counters["misses"]),
+                }
+                for tool, counters in self._stats.items()
+            }
+
+
+class CachingTool(BaseTool):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    inner: BaseTool
+    ttl: float
+    cache: ToolResultCache
+
+    def _run(self, *args, **kwargs) -> str:
+        key = normalize_query(*args, **kwargs)
+        cached = self.cache.get(self.name, key)
+        if cached is not None:
+            with span(f"tool:{self.name}", kind="tool", tool=self.name, cache_hit=True):
+                return cached
+        result = self.inner._run(*args, **kwargs)
+        self.cache.put(self.name, key, result, self.ttl)
+        return result
+
+
+def tool_ttl(name: str) -> float:
+    value = os.getenv(f"TOOL_CACHE_TTL_{name.upper()}")
+    return float(value) if value else DEFAULT_TTLS.get(name, 30.0)
+
+
+_cache: ToolResultCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_tool_cache() -> ToolResultCache:
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ToolResultCache(get_settings().tool_cache_max_entries)
+        return _cache
+
+
+def with_result_cache(tools: dict[str, BaseTool]) -> dict[str, BaseTool]:
+    cache = get_tool_cache()
+    wrapped = {}
+    for name, tool in tools.items():
+        if name in WRITE_TOOLS:
+            wrapped[name] = tool
+            continue
+        wrapped[name] = CachingTool(
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            inner=tool,
+            ttl=tool_ttl(name),
+            cache=cache,
+        )
+    return wrapped
@@ -1,88 +1,160 @@
+import asyncio
+
 from crewai.tools import BaseTool
 
+from .backends import call_backend, run_backend
+from .backends.logs import get_log_index
+from .backends.slow_queries import get_slow_query_digest
+from .backends.timeseries import get_series_store
+from .settings import get_settings
+from .tool_cache import with_result_cache
+from .tracing import traced_run
+
+
+class TracedTool(BaseTool):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if "_run" in cls.__dict__:
+            cls._run = traced_run(cls.__dict__["_run"])
+
 
-class MetricsTool(BaseTool):
+class MetricsTool(TracedTool):
     name: str = "metrics"
     description: str = "Check service metrics and error rates for the incident."
 
     def _run(self, query: str) -> str:
-        return f"Metrics snapshot for incident context: {query}"
+        return run_backend(self._arun(query))
 
+    async def _arun(self, query: str) -> str:
+        store = get_series_store()
+        if store is not None:
+            return await asyncio.to_thread(store.digest, query)
+        fallback = f"Metrics snapshot for incident context: {query}"
+        return await call_backend(self.name, query, fallback)
 
-class LogsTool(BaseTool):
+
+class LogsTool(TracedTool):
     name: str = "logs"
-    description: str = "Fetch recent logs and error traces related to the incident."
+    description: str = (
+        "Search application logs around the incident window and return error signatures "
+        "with counts. Accepts keywords plus 'last N minutes' or ISO timestamps."
+    )
 
     def _run(self, query: str) -> str:
-        return f"Recent log highlights for incident context: {query}"
+        return run_backend(self._arun(query))
+
+    async def _arun(self, query: str) -> str:
+        index = get_log_index()
+        if index is not None:
+            return await asyncio.to_thread(index.summarize, query)
+        fallback = f"Recent log highlights for incident context: {query}"
+        return await call_backend(self.name, query, fallback)
 
 
-class DeployHistoryTool(BaseTool):
+class DeployHistoryTool(TracedTool):
     name: str = "deploy_history"
     description: str = "Inspect recent deploys and rollbacks for the service."
 
     def _run(self, service: str) -> str:
-        return f"Recent deploy history for {service}: last deploy at T-30m"
+        return run_backend(self._arun(service))
+
+    async def _arun(self, service: str) -> str:
+        fallback = f"Recent deploy history for {service}: last deploy at T-30m"
+        return await call_backend(self.name, service, fallback)
 
 
-class ConfigRepoTool(BaseTool):
+class ConfigRepoTool(TracedTool):
     name: str = "config_repo"
     description: str = "Check recent config changes that could affect stability."
 
     def _run(self, service: str) -> str:
-        return f"Config diffs for {service}: no critical changes detected"
+        return run_backend(self._arun(service))
 
+    async def _arun(self, service: str) -> str:
+        fallback = f"Config diffs for {service}: no critical changes detected"
+        return await call_backend(self.name, service, fallback)
 
-class DBMetricsTool(BaseTool):
+
+class DBMetricsTool(TracedTool):
     name: str = "db_metrics"
     description: str = "Check database CPU, connections, and slow query rates."
 
     def _run(self, db: str) -> str:
-        return f"DB metrics for {db}: CPU stable, connections within limits"
+        return run_backend(self._arun(db))
+
+    async def _arun(self, db: str) -> str:
+        store = get_series_store()
+        if store is not None:
+            return await asyncio.to_thread(store.digest, db, db=True)
+        fallback = f"DB metrics for {db}: CPU stable, connections within limits"
+        return await call_backend(self.name, db, fallback)
 
 
-class QueryAnalyzerTool(BaseTool):
+class QueryAnalyzerTool(TracedTool):
     name: str = "query_analyzer"
     description: str = "Analyze slow queries and execution plans."
 
     def _run(self, db: str) -> str:
-        return f"Top slow queries for {db}: none above threshold"
+        return run_backend(self._arun(db))
 
+    async def _arun(self, db: str) -> str:
+        digest = get_slow_query_digest()
+        if digest is not None:
+            return await asyncio.to_thread(digest.digest, db)
+        fallback = f"Top slow queries for {db}: none above threshold"
+        return await call_backend(self.name, db, fallback)
 
-class SIEMTool(BaseTool):
+
+class SIEMTool(TracedTool):
     name: str = "siem"
     description: str = "Review security alerts and indicators of compromise."
 
     def _run(self, query: str) -> str:
-        return f"SIEM summary for incident context: {query}"
+        return run_backend(self._arun(query))
+
+    async def _arun(self, query: str) -> str:
+        fallback = f"SIEM summary for incident context: {query}"
+        return await call_backend(self.name, query, fallback)
 
 
-class ThreatIntelTool(BaseTool):
+class ThreatIntelTool(TracedTool):
     name: str = "threat_intel"
     description: str = "Check recent threat intelligence relevant to the incident."
 
     def _run(self, query: str) -> str:
-        return f"Threat intel check complete for: {query}"
+        return run_backend(self._arun(query))
 
+    async def _arun(self, query: str) -> str:
+        fallback = f"Threat intel check complete for: {query}"
+        return await call_backend(self.name, query, fallback)
 
-class IncidentTrackerTool(BaseTool):
+
+class IncidentTrackerTool(TracedTool):
     name: str = "incident_tracker"
     description: str = "Update incident tracker with status and actions."
 
     def _run(self, update: str) -> str:
-        return f"Incident tracker updated: {update}"
+        return run_backend(self._arun(update))
+
+    async def _arun(self, update: str) -> str:
+        fallback = f"Incident tracker updated: {update}"
+        return await call_backend(self.name, update, fallback)
 
 
-class StatusPageTool(BaseTool):
+class StatusPageTool(TracedTool):
     name: str = "status_page"
     description: str = "Post a status update for stakeholders."
 
     def _run(self, update: str) -> str:
-        return f"Status page update drafted: {update}"
+        return run_backend(self._arun(update))
+
+    async def _arun(self, update: str) -> str:
+        fallback = f"Status page update drafted: {update}"
+        return await call_backend(self.name, update, fallback)
 
 
 def build_tools() -> dict[str, BaseTool]:
-    return {
+    tools = {
         "metrics": MetricsTool(),
         "logs": LogsTool(),
         "deploy_history": DeployHistoryTool(),
@@ -94,3 +166,4 @@ def build_tools() -> dict[str, BaseTool]:
         "incident_tracker": IncidentTrackerTool(),
         "status_page": StatusPageTool(),
     }
+    return with_result_cache(tools) if get_settings().tool_cache else tools
@@ -0,0 +1,168 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from .settings import get_settings
+from .tracing import current_trace, emit, submit_traced
+
+SPECIALIST_TASKS = ("app_check", "db_check", "security_check")
+
+CATEGORY_TASKS = {
+    "deploy": ("app_check",),
+    "db": ("db_check",),
+    "security": ("security_check",),
+}
+
+CATEGORY_ALIASES = {"database": "db", "deployment": "deploy", "config": "deploy"}
+
+_CLASSIFICATION = re.compile(
+    r"classification\W+(deploy(?:ment)?|config|db|database|security|unknown)"
+    r"\W+(?:confidence\W+)?([01](?:\.\d+)?)",
+    re.IGNORECASE,
+)
+
+
+def parse_classification(text: str) -> tuple[str, float]:
+    matches = _CLASSIFICATION.findall(text or "")
+    if not matches:
+        return "unknown", 0.0
+    category, confidence = matches[-1]
+    category = category.lower()
+    return CATEGORY_ALIASES.get(category, category), min(1.0, float(confidence))
+
+
+def task_dependencies(task) -> list:
+    return task.context if isinstance(task.context, list) else []
+
+
+def task_waves(tasks: list) -> list[list]:
+    members = {id(task) for task in tasks}
+    done: set[int] = set()
+    pending = list(tasks)
+    waves = []
+    while pending:
+        wave = [
+            task
+            for task in pending
+            if all(id(dep) in done or id(dep) not in members for dep in task_dependencies(task))
+        ]
+        if not wave:
+            raise ValueError("Task context dependencies contain a cycle.")
+        waves.append(wave)
+        done.update(id(task) for task in wave)
+        pending = [task for task in pending if id(task) not in done]
+    return waves
+
+
+def run_task(task) -> None:
+    from crewai.utilities.formatter import aggregate_raw_outputs_from_tasks
+
+    context = aggregate_raw_outputs_from_tasks(task_dependencies(task)) or None
+    task.execute_sync(agent=task.agent, context=context)
+
+
+def bind_agents(tasks: list, crew) -> None:
+    if crew is None:
+        return
+    for task in tasks:
+        task.agent.crew = crew
+        if not task.agent.step_callback:
+            task.agent.step_callback = crew.step_callback
+
+
+def run_wave(tasks: list, max_workers: int) -> None:
+    workers = max(1, min(max_workers, len(tasks)))
+    if workers == 1:
+        for task in tasks:
+            run_task(task)
+        return
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="specialist") as pool:
+        futures = [submit_traced(pool, run_task, task) for task in tasks]
+        for future in futures:
+            future.result()
+
+
+class DagRouter:
+    def __init__(self, tasks: list, max_workers: int):
+        self.waves = task_waves(tasks)
+        self.max_workers = max_workers
+        self.crew = None
+
+    def __call__(self, inputs: dict | None) -> dict | None:
+        bind_agents([task for wave in self.waves for task in wave], self.crew)
+        for wave in self.waves:
+            run_wave(wave, self.max_workers)
+        trace = current_trace()
+        if trace is not None:
+            trace.root.set(router="local", router_waves=len(self.waves))
+        return inputs
+
+
+def select_specialists(category: str, confidence: float, threshold: float) -> tuple[str, ...]:
+    if confidence >= threshold and category in CATEGORY_TASKS:
+        return CATEGORY_TASKS[category]
+    return SPECIALIST_TASKS
+
+
+class AdaptiveRouter:
+    def __init__(self, tasks: dict, max_workers: int, threshold: float | None = None):
+        self.tasks = tasks
+        self.max_workers = max_workers
+        if threshold is None:
+            threshold = get_settings().adaptive_confidence
+        self.threshold = threshold
+        self.crew = None
+        self.triage_raw = ""
+        self.category = "unknown"
+        self.confidence = 0.0
+        self.selected: tuple[str, ...] = SPECIALIST_TASKS
+
+    def capture(self, output_filter: Callable[[str], str] | None) -> Callable[[str], str]:
+        def capture_triage(raw: str) -> str:
+            self.triage_raw = raw
+            return output_filter(raw) if output_filter else raw
+
+        return capture_triage
+
+    @property
+    def skipped(self) -> list[str]:
+        return [name for name in SPECIALIST_TASKS if name not in self.selected]
+
+    def __call__(self, inputs: dict | None) -> dict | None:
+        triage = self.tasks["triage"]
+        bind_agents([triage, *(self.tasks[name] for name in SPECIALIST_TASKS)], self.crew)
+        report = triage.execute_sync(agent=triage.agent).pydantic
+        if report is not None and hasattr(report, "classification"):
+            self.category, self.confidence = report.classification, report.confidence
+        else:
+            self.category, self.confidence = parse_classification(self.triage_raw)
+        self.selected = select_specialists(self.category, self.confidence, self.threshold)
+        if self.skipped:
+            emit("tasks_skipped", tasks=self.skipped, reason=f"triage: {self.category}")
+
+        selected = [self.tasks[name] for name in self.selected]
+        run_wave(selected, self.max_workers)
+        self.tasks["commander"].context = [triage, *selected]
+        self.report()
+        return inputs
+
+    def calls_saved(self) -> int:
+        trace = current_trace()
+        if not self.skipped or trace is None:
+            return len(self.skipped)
+        calls = sum(
+            1 for span in trace.spans if span.kind == "llm" and span.task in self.selected
+        )
+        return round(len(self.skipped) * max(1.0, calls / len(self.selected)))
+
+    def report(self) -> dict:
+        summary = {
+            "topology_category": self.category,
+            "topology_confidence": self.confidence,
+            "topology_skipped": ",".join(self.skipped) or "none",
+            "llm_calls_saved": self.calls_saved(),
+        }
+        trace = current_trace()
+        if trace is not None:
+            trace.root.set(**summary)
+        return summary
@@ -0,0 +1,255 @@
+import contextvars
+import functools
+import json
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from .settings import get_settings
+
+_current_trace: contextvars.ContextVar["Trace | None"] = contextvars.ContextVar(
+    "current_trace", default=None
+)
+_current_span: contextvars.ContextVar["Span | None"] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+class Span:
+    def __init__(self, trace: "Trace", name: str, kind: str, parent: "Span | None"):
+        self.trace = trace
+        self.name = name
+        self.kind = kind
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent.span_id if parent else None
+        self.task = parent.task if parent else None
+        self.start_ns = time.time_ns()
+        self.end_ns: int | None = None
+        self.last_mark_ns = self.start_ns
+        self.attributes: dict = {}
+        self.status = "ok"
+
+    @property
+    def duration_ms(self) -> float:
+        end_ns = self.end_ns or time.time_ns()
+        return (end_ns - self.start_ns) / 1e6
+
+    def set(self, **attributes) -> None:
+        self.attributes.update({k: v for k, v in attributes.items() if v is not None})
+
+    def add(self, name: str, amount: float) -> None:
+        self.attributes[name] = self.attributes.get(name, 0) + amount
+
+
+class NullSpan:
+    def set(self, **attributes) -> None:
+        pass
+
+    def add(self, name: str, amount: float) -> None:
+        pass
+
+
+NULL_SPAN = NullSpan()
+
+
+class Trace:
+    def __init__(self, name: str, listeners: list | None = None):
+        self.name = name
+        self.listeners = list(listeners or [])
+        self.trace_id = secrets.token_hex(16)
+        self.spans: list[Span] = []
+        self.export_path: Path | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def root(self) -> Span | NullSpan:
+        return self.spans[0] if self.spans else NULL_SPAN
+
+    def start_span(self, name: str, kind: str, parent: Span | None) -> Span:
+        span = Span(self, name, kind, parent)
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+    def summary(self) -> list[dict]:
+        root_start = min((span.start_ns for span in self.spans), default=0)
+        return [
+            {
+                "name": span.name,
+                "kind": span.kind,
+                "span_id": span.span_id,
+                "parent_id": span.parent_id,
+                "offset_ms": (span.start_ns - root_start) / 1e6,
+                "duration_ms": span.duration_ms,
+                "status": span.status,
+                **span.attributes,
+            }
+            for span in sorted(self.spans, key=lambda span: span.start_ns)
+        ]
+
+    def to_otlp(self) -> dict:
+        def attribute(key, value):
+            if isinstance(value, bool):
+                return {"key": key, "value": {"boolValue": value}}
+            if isinstance(value, int):
+                return {"key": key, "value": {"intValue": str(value)}}
+            if isinstance(value, float):
+                return {"key": key, "value": {"doubleValue": value}}
+            return {"key": key, "value": {"stringValue": str(value)}}
+
+        spans = []
+        for span in self.spans:
+            spans.append(
+                {
+                    "traceId": self.trace_id,
+                    "spanId": span.span_id,
+                    "parentSpanId": span.parent_id or "",
+                    "name": span.name,
+                    "kind": 1,
+                    "startTimeUnixNano": str(span.start_ns),
+                    "endTimeUnixNano": str(span.end_ns or span.start_ns),
+                    "attributes": [attribute("warroom.kind", span.kind)]
+                    + [attribute(k, v) for k, v in span.attributes.items()],
+                    "status": {"code": 2 if span.status == "error" else 1},
+                }
+            )
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {"attributes": [attribute("service.name", self.name)]},
+                    "scopeSpans": [{"scope": {"name": "crew.tracing"}, "spans": spans}],
+                }
+            ]
+        }
+
+
+class FileExporter:
+    def __init__(self, directory: str | None = None):
+        root = Path(__file__).resolve().parents[2]
+        self.directory = Path(directory or os.getenv("TRACE_DIR") or root / ".traces")
+
+    def export(self, trace: Trace) -> Path:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{trace.trace_id}.json"
+        path.write_text(json.dumps(trace.to_otlp(), indent=2), encoding="utf-8")
+        return path
+
+
+def current_trace() -> Trace | None:
+    return _current_trace.get()
+
+
+def current_span() -> Span | NullSpan:
+    return _current_span.get() or NULL_SPAN
+
+
+@contextmanager
+def start_trace(
+    name: str,
+    exporter: FileExporter | None = None,
+    listeners: list | None = None,
+) -> Iterator[Trace]:
+    trace = Trace(name, listeners)
+    trace_token = _current_trace.set(trace)
+    try:
+        with span(name, kind="crew"):
+            yield trace
+    finally:
+        _current_trace.reset(trace_token)
+        if get_settings().tracing:
+            trace.export_path = (exporter or FileExporter()).export(trace)
+
+
+@contextmanager
+def span(name: str, kind: str, **attributes) -> Iterator[Span | NullSpan]:
+    trace = _current_trace.get()
+    if trace is None:
+        yield NULL_SPAN
+        return
+    current = trace.start_span(name, kind, _current_span.get())
+    current.set(**attributes)
+    if kind == "task":
+        current.task = attributes.get("task") or name
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as exc:
+        current.status = "error"
+        current.set(error=type(exc).__name__)
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end_ns = time.time_ns()
+
+
+def emit(kind: str, **data) -> None:
+    trace = _current_trace.get()
+    if trace is None or not trace.listeners:
+        return
+    current = _current_span.get()
+    event = {"kind": kind, "task": current.task if current else None, **data}
+    for listener in trace.listeners:
+        try:
+            listener(event)
+        except Exception:
+            pass
+
+
+def record_step(step) -> None:
+    parent = _current_span.get()
+    trace = _current_trace.get()
+    if parent is None or trace is None:
+        return
+    step_span = trace.start_span(f"step:{type(step).__name__}", "step", parent)
+    step_span.start_ns = parent.last_mark_ns
+    step_span.end_ns = parent.last_mark_ns = time.time_ns()
+    tool = getattr(step, "tool", None)
+    tool = tool if isinstance(tool, str) else None
+    step_span.set(tool=tool)
+    text = getattr(step, "thought", None) or getattr(step, "output", None) or ""
+    emit("step", tool=tool, text=str(text)[:300])
+
+
+def submit_traced(pool, fn, *args, **kwargs):
+    return pool.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+
+
+def traced_run(run):
+    @functools.wraps(run)
+    def wrapper(self, *args, **kwargs):
+        with span(f"tool:{self.name}", kind="tool", tool=self.name) as current:
+            result = run(self, *args, **kwargs)
+            current.set(tokens_out=len(str(result)) // 4)
+            return result
+
+    return wrapper
+
+
+def tier_report(spans: list[dict]) -> dict[str, dict]:
+    tiers: dict[str, dict] = {}
+    for record in spans:
+        if record["kind"] != "llm":
+            continue
+        entry = tiers.setdefault(
+            record.get("tier", "strong"),
+            {"models": set(), "calls": 0, "cache_hits": 0, "seconds": 0.0, "cost_usd": 0.0},
+        )
+        entry["models"].add(record.get("model"))
+        entry["calls"] += 1
+        entry["cache_hits"] += bool(record.get("cache_hit"))
+        entry["seconds"] += record["duration_ms"] / 1000
+        entry["cost_usd"] += record.get("cost_usd") or 0.0
+    escalations = sum(
+        1 for record in spans if record["kind"] == "task" and record.get("escalated")
+    )
+    for entry in tiers.values():
+        entry["models"] = ",".join(sorted(filter(None, entry["models"])))
+        entry["seconds"] = round(entry["seconds"], 3)
+        entry["cost_usd"] = round(entry["cost_usd"], 6)
+    if "fast" in tiers:
+        tiers["fast"]["escalations"] = escalations
+    return tiers
@@ -1,29 +1,65 @@
-import os
-import sys
-from crew.crew import build_crew
+import argparse
+from crew.cache import get_response_cache
+from crew.settings import Settings, SettingsError, get_settings, override_settings
 
 DEFAULT_INCIDENT = "Payments API returns 500s after a deploy; customer complaints increasing."
 
-def load_env() -> None:
-    env_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env")
-    if not os.path.exists(env_path):
-        return
+def parse_args(settings: Settings) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the incident response crew.")
+    parser.add_argument("incident", nargs="*", help="Incident description")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the LLM response cache for this run",
+    )
+    parser.add_argument(
+        "--batch",
+        metavar="PATH",
+        help="Run incidents from a JSONL file ('-' for stdin) and stream JSONL results",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.batch_concurrency,
+        help="Number of crews to run at once in batch mode",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        metavar="PATH",
+        help="Checkpoint file used to resume an interrupted batch",
+    )
+    return parser.parse_args()
+
+def run_batch(args: argparse.Namespace) -> None:
+    import json
+    import sys
+    from pathlib import Path
+
+    from crew.batch import BatchRunner, default_checkpoint, parse_incidents
 
-    with open(env_path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#") or "=" not in line:
-                continue
-            key, value = line.split("=", 1)
-            key = key.strip()
-            value = value.strip().strip("\"")
-            os.environ[key] = value
+    checkpoint = Path(args.checkpoint) if args.checkpoint else default_checkpoint(args.batch)
+    runner = BatchRunner(sys.stdout, checkpoint, args.concurrency)
+    if args.batch == "-":
+        report = runner.run(parse_incidents(sys.stdin))
+    else:
+        with open(args.batch, "r", encoding="utf-8") as f:
+            report = runner.run(parse_incidents(f))
+    print(f"Batch report: {json.dumps(report)}", file=sys.stderr)
 
 def main() -> None:
-    load_env()
+    try:
+        settings = get_settings()
+    except SettingsError as exc:
+        raise SystemExit(f"Invalid configuration: {exc}")
+    args = parse_args(settings)
+    if args.no_cache:
+        override_settings(LLM_CACHE="false")
+    if args.batch:
+        run_batch(args)
+        return
     
     # Allow taking the incident from command line arguments
-    incident_input = " ".join(sys.argv[1:]).strip() or DEFAULT_INCIDENT
+    incident_input = " ".join(args.incident).strip() or DEFAULT_INCIDENT
     
     print("\n" + "="*50)
     print(f"🚀 INITIALIZING MULTI-AGENT RESEARCH LAB")
@@ -31,18 +67,22 @@ def main() -> None:
     print("="*50 + "\n")
 
     # Build the Crew (Memory and Hierarchical process are already inside build_crew)
-    crew = build_crew(incident_input)
-    
+    from crew.crew import build_crew
+    from crew.tracing import start_trace, tier_report
+
     # Kickoff the process
     # The 'verbose=True' in your crew.py will show the "Thoughts" automatically
-    result = crew.kickoff()
+    with start_trace("incident-war-room") as trace:
+        crew = build_crew(incident_input)
+        result = crew.kickoff()
 
     print("\n" + "="*50)
     print("🏁 INCIDENT RESOLUTION COMPLETE")
     print("="*50)
     
     # Print the final synthesized output from the Comms Lead/Commander
-    print(f"\nFINAL MISSION REPORT:\n{result}")
+    report = result.pydantic.model_dump_json(indent=2) if result.pydantic else result
+    print(f"\nFINAL MISSION REPORT:\n{report}")
     
     # Optional: Print usage metrics to show the 'efficiency' of the MAS
     if hasattr(result, 'token_usage'):
@@ -50,5 +90,58 @@ def main() -> None:
         print(f"Efficiency Metrics: {result.token_usage}")
         print("-"*30)
 
+    slowest = sorted(
+        (span for span in trace.summary() if span["kind"] in {"task", "tool", "llm"}),
+        key=lambda span: span["duration_ms"],
+        reverse=True,
+    )[:5]
+    if slowest:
+        print("\nSlowest Spans:")
+        for span in slowest:
+            print(f"  {span['duration_ms']:>9.1f}ms  {span['name']}")
+    baseline = trace.root.attributes.get("context_baseline_tokens", 0)
+    sent = trace.root.attributes.get("context_sent_tokens", 0)
+    if baseline:
+        print(f"Prompt context: {sent} of {baseline} tokens sent ({1 - sent / baseline:.0%} saved)")
+    if trace.root.attributes.get("prior_incident_score") is not None:
+        path = trace.root.attributes["incident_path"].replace("_", " ")
+        score = trace.root.attributes["prior_incident_score"]
+        print(f"Similar past incident: {score:.2f} similarity ({path} path)")
+    skipped = trace.root.attributes.get("topology_skipped")
+    if skipped:
+        category = trace.root.attributes.get("topology_category")
+        confidence = trace.root.attributes.get("topology_confidence", 0.0)
+        saved = trace.root.attributes.get("llm_calls_saved", 0)
+        print(
+            f"Topology: {category} ({confidence:.2f}) skipped {skipped}, "
+            f"~{saved} LLM calls saved"
+        )
+    if trace.root.attributes.get("router") == "local":
+        tools = [span.attributes.get("tool") or "" for span in trace.spans if span.kind == "step"]
+        delegations = sum(1 for tool in tools if tool.startswith("Delegate"))
+        print(
+            f"Router: local DAG ({trace.root.attributes['router_waves']} waves), "
+            f"{delegations} delegations, 0 manager calls"
+        )
+    tiers = tier_report(trace.summary())
+    if len(tiers) > 1 or "fast" in tiers:
+        print("\nModel Tiers:")
+        for tier, stats in tiers.items():
+            escalated = f", {stats['escalations']} escalated" if "escalations" in stats else ""
+            print(
+                f"  {tier:<6} {stats['models']}: {stats['calls']} calls, "
+                f"{stats['seconds']:.1f}s, ${stats['cost_usd']:.4f}{escalated}"
+            )
+    if trace.export_path:
+        print(f"Trace: {trace.export_path}")
+
+    cache = get_response_cache()
+    if cache is not None:
+        print(f"LLM Cache: {cache.stats()}")
+
+    from crew.tool_cache import get_tool_cache
+
+    print(f"Tool Cache: {get_tool_cache().stats()}")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,35 +1,158 @@
-import io
-import os
-from contextlib import redirect_stdout
+import json
+import time
+from typing import TYPE_CHECKING
 
 import streamlit as st
 
-from crew.crew import build_crew
+from crew.settings import SettingsError, get_settings
+from crew.tracing import tier_report
+
+if TYPE_CHECKING:
+    from crew.jobs import JobRunner
 
 
 DEFAULT_INCIDENT = "Payments API returns 500s after a deploy; customer complaints increasing."
 
+TASK_LABELS = {
+    "triage": "SRE Triage",
+    "app_check": "App Engineer",
+    "db_check": "Database Specialist",
+    "security_check": "Security Analyst",
+    "commander": "Incident Commander",
+    "comms": "Comms Lead",
+}
+
+STREAMED_TASKS = {"comms"}
+
+INCIDENT_HANDLER = "crew.jobs:run_incident_job"
+
+
+@st.cache_resource
+def get_job_runner() -> "JobRunner":
+    from crew.jobs import JobRunner
+
+    return JobRunner(handlers=(INCIDENT_HANDLER,))
+
+
+def format_fields(data: dict) -> str:
+    lines = []
+    for key, value in data.items():
+        label = key.replace("_", " ").capitalize()
+        if isinstance(value, list) and value:
+            items = [
+                " — ".join(str(v) for v in item.values()) if isinstance(item, dict) else str(item)
+                for item in value
+            ]
+            lines.append(f"**{label}**\n" + "\n".join(f"- {item}" for item in items))
+        elif value not in (None, "", []):
+            lines.append(f"**{label}:** {value}")
+    return "\n\n".join(lines)
+
+
+def render_output(text: str | None) -> str:
+    try:
+        data = json.loads(text or "")
+    except ValueError:
+        return text or ""
+    return format_fields(data) if isinstance(data, dict) else text
+
 
-def load_env() -> None:
-    env_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), ".env")
-    if not os.path.exists(env_path):
+def render_waterfall(spans: list[dict]) -> None:
+    import altair as alt
+
+    rows = [
+        {**span, "end_ms": span["offset_ms"] + span["duration_ms"]}
+        for span in spans
+        if span["kind"] != "step"
+    ]
+    if not rows:
+        st.info("No spans recorded.")
+        return
+    chart = (
+        alt.Chart(alt.Data(values=rows))
+        .mark_bar()
+        .encode(
+            x=alt.X("offset_ms:Q", title="ms since kickoff"),
+            x2="end_ms:Q",
+            y=alt.Y("span_id:N", sort=None, axis=None),
+            color=alt.Color("kind:N"),
+            tooltip=["name:N", "kind:N", "duration_ms:Q", "tokens_in:Q", "tokens_out:Q"],
+        )
+        .properties(height=max(120, 18 * len(rows)))
+    )
+    st.altair_chart(chart, use_container_width=True)
+
+
+def render_events(events: list[dict]) -> None:
+    panels = {name: st.empty() for name in TASK_LABELS}
+    steps: list[str] = []
+    streamed: dict[str, str] = {}
+    completed: set[str] = set()
+
+    for event in events:
+        task = event.get("task")
+        label = TASK_LABELS.get(task, task or "Crew")
+        if event["kind"] == "task_started" and task in panels and task not in completed:
+            panels[task].info(f"{label} is working...")
+        elif event["kind"] == "task_completed" and task in panels:
+            completed.add(task)
+            body = format_fields(event["data"]) if event.get("data") else event.get("output")
+            panels[task].markdown(f"#### {label}\n\n{body or ''}")
+        elif event["kind"] == "tasks_skipped":
+            for name in event.get("tasks") or []:
+                completed.add(name)
+                panels[name].caption(f"{TASK_LABELS[name]} skipped ({event.get('reason')})")
+        elif event["kind"] == "token" and task in STREAMED_TASKS and task not in completed:
+            streamed[task] = streamed.get(task, "") + (event.get("text") or "")
+            panels[task].text(f"{label} (drafting)\n\n{streamed[task]}")
+        elif event["kind"] == "step":
+            tool = f" → `{event['tool']}`" if event.get("tool") else ""
+            steps.append(f"- **{label}**{tool}: {event.get('text', '')}")
+
+    st.progress(len(completed) / len(TASK_LABELS), text=f"{len(completed)} tasks finished")
+    with st.expander("Live agent activity"):
+        st.markdown("\n".join(steps[-12:]) or "No steps yet.")
+
+
+def render_job(runner: "JobRunner", job_id: str) -> None:
+    job = runner.get(job_id)
+    if job is None:
+        st.warning(f"Job {job_id} not found.")
         return
 
-    with open(env_path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line or line.startswith("#") or "=" not in line:
-                continue
-            key, value = line.split("=", 1)
-            key = key.strip()
-            value = value.strip().strip("\"")
-            os.environ[key] = value
+    st.caption(f"Job {job_id} · {job['status']}")
+    events = runner.events(job_id)
+    render_events(events)
 
+    if job["status"] == "failed":
+        st.error(f"Crew failed: {job['error']}")
+        return
+    if job["status"] != "done":
+        time.sleep(get_settings().job_poll_seconds)
+        st.rerun()
 
-def main() -> None:
-    load_env()
+    st.success("Complete")
+    st.subheader("Final Mission Report")
+    st.markdown(render_output(job["result"]))
+
+    trace = next((event for event in reversed(events) if event["kind"] == "trace"), None)
+    if trace:
+        with st.expander("Trace waterfall"):
+            render_waterfall(trace["spans"])
+        tiers = tier_report(trace["spans"])
+        if tiers:
+            with st.expander("Model tiers"):
+                st.table([{"tier": tier, **stats} for tier, stats in tiers.items()])
 
+
+def main() -> None:
     st.set_page_config(page_title="Incident Response MAS", layout="wide")
+    try:
+        get_settings()
+    except SettingsError as exc:
+        st.error(f"Invalid configuration: {exc}")
+        st.stop()
+
     st.title("Incident Response War Room")
     st.caption("Multi‑Agent System powered by CrewAI")
 
@@ -51,20 +174,14 @@ def main() -> None:
     incident = st.text_area("Describe the incident", value=DEFAULT_INCIDENT, height=120)
     run = st.button("Assemble Crew", type="primary")
 
+    runner = get_job_runner()
     if run:
-        output = io.StringIO()
-        with st.spinner("Running crew..."):
-            crew = build_crew(incident)
-            with redirect_stdout(output):
-                result = crew.kickoff()
-
-        st.success("Complete")
-
-        st.subheader("Final Mission Report")
-        st.write(result)
+        job_id = runner.submit(INCIDENT_HANDLER, {"incident": incident})
+        st.query_params["job"] = job_id
 
-        with st.expander("Agent Internal Reasoning (verbose logs)"):
-            st.text(output.getvalue())
+    job_id = st.query_params.get("job")
+    if job_id:
+        render_job(runner, job_id)
 
 
 if __name__ == "__main__":
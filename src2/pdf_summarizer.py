@@ -1,92 +1,272 @@
 import os
+import re
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, Iterator
 
 ROOT = Path(__file__).resolve().parents[1]
-sys.path.append(str(ROOT / "src"))
+if str(ROOT / "src") not in sys.path:
+    sys.path.append(str(ROOT / "src"))
 
-from crewai import Agent, Crew, Process, Task
+from crew.ratelimit import estimate_tokens
+from crew.settings import SettingsError, get_settings
+from crew.tracing import submit_traced
+from pdf_text import iter_pdf_pages
 
-from crew.agents import build_llm
+if TYPE_CHECKING:
+    from crewai import Agent, Crew
 
+_UNIT_SPLIT = re.compile(r"(?<=[.!?])\s+|\n\s*\n")
+_POINT_PREFIX = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+")
+_WORD = re.compile(r"[a-z0-9]+")
 
-def load_env() -> None:
-    env_path = Path(__file__).resolve().parents[1] / ".env"
-    if not env_path.exists():
-        return
 
-    for line in env_path.read_text(encoding="utf-8").splitlines():
-        line = line.strip()
-        if not line or line.startswith("#") or "=" not in line:
-            continue
-        key, value = line.split("=", 1)
-        os.environ[key.strip()] = value.strip().strip('"')
+def iter_units(segments: str | Iterable[str], max_tokens: int) -> Iterator[str]:
+    if isinstance(segments, str):
+        segments = [segments]
+    max_chars = max_tokens * 4
+    for segment in segments:
+        for unit in _UNIT_SPLIT.split(segment):
+            unit = " ".join(unit.split())
+            while len(unit) > max_chars:
+                yield unit[:max_chars]
+                unit = unit[max_chars:]
+            if unit:
+                yield unit
 
 
-def read_pdf_text(pdf_path: Path) -> str:
-    try:
-        from pypdf import PdfReader
-    except ImportError as exc:
-        raise SystemExit("Install pypdf: pip install pypdf") from exc
+def chunk_text(
+    segments: str | Iterable[str],
+    max_tokens: int | None = None,
+    overlap_tokens: int | None = None,
+) -> Iterator[str]:
+    max_tokens = max_tokens or int(os.getenv("PDF_CHUNK_TOKENS", "3000"))
+    if overlap_tokens is None:
+        overlap_tokens = int(os.getenv("PDF_CHUNK_OVERLAP_TOKENS", "200"))
 
-    reader = PdfReader(str(pdf_path))
-    pages = [page.extract_text() or "" for page in reader.pages]
-    text = "\n".join(pages).strip()
-    if not text:
-        raise SystemExit("No extractable text found in the PDF.")
-    return text
+    window: list[str] = []
+    size = 0
+    for unit in iter_units(segments, max_tokens):
+        tokens = estimate_tokens(unit)
+        if window and size + tokens > max_tokens:
+            yield " ".join(window)
+            tail: list[str] = []
+            tail_size = 0
+            for previous in reversed(window):
+                previous_tokens = estimate_tokens(previous)
+                if tail_size + previous_tokens > overlap_tokens:
+                    break
+                tail.insert(0, previous)
+                tail_size += previous_tokens
+            window, size = tail, tail_size
+        window.append(unit)
+        size += tokens
+    if window:
+        yield " ".join(window)
 
 
-def build_pdf_crew(doc_text: str) -> Crew:
-    llm = build_llm()
-    if llm is None:
-        raise RuntimeError(
-            "No LLM configured. Set GOOGLE_API_KEY or OPENAI_API_KEY (or LLM_MODEL)."
-        )
+def parse_points(text: str) -> list[str]:
+    points = []
+    for line in str(text).splitlines():
+        if _POINT_PREFIX.match(line):
+            point = _POINT_PREFIX.sub("", line).strip()
+            if point:
+                points.append(point)
+    return points
+
 
-    extractor = Agent(
+def dedupe_points(points: list[str], threshold: float = 0.8) -> list[str]:
+    kept: list[tuple[str, set[str]]] = []
+    for point in points:
+        words = set(_WORD.findall(point.lower()))
+        if not words:
+            continue
+        duplicate = False
+        for index, (existing, existing_words) in enumerate(kept):
+            overlap = len(words & existing_words) / len(words | existing_words)
+            if overlap >= threshold:
+                if len(point) > len(existing):
+                    kept[index] = (point, words)
+                duplicate = True
+                break
+        if not duplicate:
+            kept.append((point, words))
+    return [point for point, _ in kept]
+
+
+def format_points(points: list[str]) -> str:
+    return "\n".join(f"- {point}" for point in points)
+
+
+def build_extractor(llm) -> "Agent":
+    from crewai import Agent
+
+    return Agent(
         role="Document Extractor",
         goal="Pull key points and facts from the provided document.",
         backstory="Focused on accurate extraction without adding new facts.",
         llm=llm,
     )
 
-    summarizer = Agent(
-        role="Summarizer",
-        goal="Write a concise summary based on extracted points only.",
-        backstory="Produces clear, short summaries for quick review.",
-        llm=llm,
+
+def output_points(output) -> list[str]:
+    if output.pydantic is not None:
+        return [point.strip() for point in output.pydantic.points if point.strip()]
+    return parse_points(output.raw)
+
+
+def extract_chunk(chunk: str, index: int, llm) -> list[str]:
+    from crew.schemas import KeyPoints
+    from crew.tasks import TracedTask
+
+    structured = get_settings().structured_outputs
+    extractor = build_extractor(llm)
+    task = TracedTask(
+        name=f"extract_{index + 1}",
+        description=(
+            f"Extract the key points and facts from section {index + 1} of a larger "
+            "document."
+            + ("" if structured else " Return one point per line, each starting with '- '.")
+            + f"\n\nSection:\n{chunk}"
+        ),
+        agent=extractor,
+        expected_output="List of key points.",
+        output_pydantic=KeyPoints if structured else None,
     )
+    return output_points(task.execute_sync(agent=extractor))
 
-    extract_task = Task(
+
+def condense_points(points: list[str], llm) -> list[str]:
+    from crew.schemas import KeyPoints
+    from crew.tasks import TracedTask
+
+    structured = get_settings().structured_outputs
+    extractor = build_extractor(llm)
+    task = TracedTask(
+        name="condense",
         description=(
-            "Extract the top 8-12 key points from this document.\n\n"
-            f"Document:\n{doc_text}"
+            "Merge these key points from adjacent sections of a document. Combine "
+            "duplicates and keep every distinct fact."
+            + ("" if structured else " Return one point per line, each starting with '- '.")
+            + f"\n\nPoints:\n{format_points(points)}"
         ),
         agent=extractor,
-        expected_output="Bullet list of key points.",
+        expected_output="List of merged key points.",
+        output_pydantic=KeyPoints if structured else None,
     )
+    return output_points(task.execute_sync(agent=extractor)) or points
+
 
-    summarize_task = Task(
+def map_chunks(chunks: Iterable[str], llm, max_workers: int) -> list[list[str]]:
+    in_flight = threading.BoundedSemaphore(max_workers * 2)
+    futures = []
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="extract") as pool:
+        for index, chunk in enumerate(chunks):
+            in_flight.acquire()
+            future = submit_traced(pool, extract_chunk, chunk, index, llm)
+            future.add_done_callback(lambda _: in_flight.release())
+            futures.append(future)
+        return [future.result() for future in futures]
+
+
+def reduce_points(groups: list[list[str]], llm, max_workers: int) -> list[str]:
+    fan_in = int(os.getenv("PDF_REDUCE_FAN_IN", "4"))
+    budget = int(os.getenv("PDF_REDUCE_TOKENS", "2000"))
+    level = [dedupe_points(group) for group in groups] or [[]]
+
+    def merge(batch: list[list[str]]) -> list[str]:
+        merged = dedupe_points([point for group in batch for point in group])
+        if estimate_tokens(format_points(merged)) > budget:
+            merged = dedupe_points(condense_points(merged, llm))
+        return merged
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="reduce") as pool:
+        while len(level) > 1:
+            batches = [level[i : i + fan_in] for i in range(0, len(level), fan_in)]
+            futures = [submit_traced(pool, merge, batch) for batch in batches]
+            level = [future.result() for future in futures]
+    return level[0]
+
+
+def build_map_reduce(segments: str | Iterable[str], llm):
+    max_workers = get_settings().pdf_map_workers
+
+    def map_reduce(inputs: dict | None) -> dict:
+        groups = map_chunks(chunk_text(segments), llm, max_workers)
+        if not groups:
+            raise ValueError("No extractable text found in the document.")
+        points = reduce_points(groups, llm, max_workers)
+        return {**(inputs or {}), "key_points": format_points(points)}
+
+    return map_reduce
+
+
+def build_pdf_crew(
+    doc_text: str | Iterable[str],
+    llm=None,
+    synthesis_llm=None,
+) -> "Crew":
+    from crewai import Agent, Crew, Process
+
+    from crew.llm import build_llm
+    from crew.schemas import DocumentSummary
+    from crew.tasks import TracedTask
+    from crew.tracing import record_step
+
+    llm = llm or build_llm(tier="fast")
+    synthesis_llm = synthesis_llm or build_llm(lane="synthesis", tier="strong")
+    if llm is None:
+        raise RuntimeError(
+            "No LLM configured. Set GOOGLE_API_KEY or OPENAI_API_KEY (or LLM_MODEL)."
+        )
+
+    summarizer = Agent(
+        role="Summarizer",
+        goal="Write a concise summary based on extracted points only.",
+        backstory="Produces clear, short summaries for quick review.",
+        llm=synthesis_llm,
+    )
+
+    summarize_task = TracedTask(
+        name="summarize",
         description=(
-            "Write a short summary (6-10 sentences) using only the extracted points."
+            "Write a short summary (6-10 sentences) using only the extracted points.\n\n"
+            "Extracted points:\n{key_points}"
         ),
         agent=summarizer,
-        expected_output="Concise summary paragraph(s).",
-        context=[extract_task],
+        expected_output="Short title, concise summary paragraph(s) and the main points.",
+        output_pydantic=DocumentSummary if get_settings().structured_outputs else None,
     )
 
     return Crew(
-        agents=[extractor, summarizer],
-        tasks=[extract_task, summarize_task],
+        agents=[summarizer],
+        tasks=[summarize_task],
         process=Process.sequential,
         memory=False,
+        before_kickoff_callbacks=[build_map_reduce(doc_text, llm)],
+        step_callback=record_step,
         verbose=True,
     )
 
 
+def run_pdf_job(payload: dict) -> str:
+    pdf_path = Path(payload["pdf_path"]) if payload.get("pdf_path") else None
+    try:
+        segments = iter_pdf_pages(pdf_path) if pdf_path else payload["text"]
+        result = build_pdf_crew(segments).kickoff()
+    finally:
+        if pdf_path and payload.get("cleanup"):
+            pdf_path.unlink(missing_ok=True)
+    return str(getattr(result, "raw", result)).strip()
+
+
 def main() -> None:
-    load_env()
+    try:
+        get_settings()
+    except SettingsError as exc:
+        raise SystemExit(f"Invalid configuration: {exc}")
     if len(sys.argv) < 2:
         raise SystemExit("Usage: python src2/pdf_summarizer.py <path-to-pdf>")
 
@@ -94,10 +274,12 @@ def main() -> None:
     if not pdf_path.exists():
         raise SystemExit(f"File not found: {pdf_path}")
 
-    doc_text = read_pdf_text(pdf_path)
-    crew = build_pdf_crew(doc_text)
+    crew = build_pdf_crew(iter_pdf_pages(pdf_path))
     result = crew.kickoff()
-    print(result)
+    if result.pydantic is not None:
+        print(result.pydantic.model_dump_json(indent=2))
+    else:
+        print(result)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,96 @@
+import hashlib
+import os
+from collections import deque
+from pathlib import Path
+from typing import Iterator
+
+ROOT = Path(__file__).resolve().parents[1]
+PAGE_BREAK = "\f"
+
+
+def _pdf_reader(pdf_path: Path):
+    try:
+        from pypdf import PdfReader
+    except ImportError as exc:
+        raise SystemExit("Install pypdf: pip install pypdf") from exc
+    return PdfReader(str(pdf_path))
+
+
+def _extract_range(pdf_path: str, start: int, stop: int) -> list[str]:
+    reader = _pdf_reader(Path(pdf_path))
+    return [reader.pages[index].extract_text() or "" for index in range(start, stop)]
+
+
+def file_digest(pdf_path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(pdf_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def build_text_cache_path(digest: str) -> Path:
+    return ROOT / ".pdf_text_cache" / f"{digest}.txt"
+
+
+def iter_cached_pages(cache_path: Path) -> Iterator[str]:
+    pending = ""
+    with open(cache_path, "r", encoding="utf-8") as f:
+        for block in iter(lambda: f.read(1 << 16), ""):
+            pending += block
+            *pages, pending = pending.split(PAGE_BREAK)
+            yield from pages
+    if pending:
+        yield pending
+
+
+def iter_parsed_pages(pdf_path: Path) -> Iterator[str]:
+    page_count = len(_pdf_reader(pdf_path).pages)
+    workers = int(os.getenv("PDF_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+    min_pages = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "32"))
+    batch = int(os.getenv("PDF_PAGES_PER_BATCH", "8"))
+
+    if workers <= 1 or page_count < min_pages:
+        for start in range(0, page_count, batch):
+            yield from _extract_range(str(pdf_path), start, min(start + batch, page_count))
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    ranges = iter(
+        (start, min(start + batch, page_count)) for start in range(0, page_count, batch)
+    )
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for start, stop in ranges:
+            pending.append(pool.submit(_extract_range, str(pdf_path), start, stop))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def iter_pdf_pages(pdf_path: Path) -> Iterator[str]:
+    cache_path = build_text_cache_path(file_digest(pdf_path))
+    if cache_path.exists():
+        yield from iter_cached_pages(cache_path)
+        return
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    partial_path = cache_path.with_suffix(f".{os.getpid()}.partial")
+    try:
+        with open(partial_path, "w", encoding="utf-8") as f:
+            for index, page in enumerate(iter_parsed_pages(pdf_path)):
+                page = page.replace(PAGE_BREAK, "\n")
+                f.write(page if index == 0 else PAGE_BREAK + page)
+                yield page
+        os.replace(partial_path, cache_path)
+    finally:
+        partial_path.unlink(missing_ok=True)
+
+
+def read_pdf_text(pdf_path: Path) -> str:
+    text = "\n".join(iter_pdf_pages(pdf_path)).strip()
+    if not text:
+        raise SystemExit("No extractable text found in the PDF.")
+    return text
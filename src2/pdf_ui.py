@@ -1,24 +1,93 @@
-import io
-import os
+import hashlib
 import sys
-import tempfile
-from contextlib import redirect_stdout
+import time
+import uuid
 from pathlib import Path
+from typing import TYPE_CHECKING
 
 ROOT = Path(__file__).resolve().parents[1]
-sys.path.append(str(ROOT / "src2"))
+for path in (ROOT / "src2", ROOT / "src"):
+    if str(path) not in sys.path:
+        sys.path.append(str(path))
 
 import streamlit as st
 
-from pdf_summarizer import build_pdf_crew, load_env, read_pdf_text
+from crew.schemas import DocumentSummary, parse_output
+from crew.settings import SettingsError, get_settings
 
+if TYPE_CHECKING:
+    from crew.jobs import JobRunner
 
-def main() -> None:
-    load_env()
+PDF_HANDLER = "pdf_summarizer:run_pdf_job"
+
+
+@st.cache_resource
+def get_job_runner() -> "JobRunner":
+    from crew.jobs import JobRunner
+
+    return JobRunner(handlers=(PDF_HANDLER,))
+
+
+def save_upload(data: bytes) -> Path:
+    from crew.jobs import build_jobs_path
+
+    uploads = Path(build_jobs_path()).parent / "uploads"
+    uploads.mkdir(parents=True, exist_ok=True)
+    path = uploads / f"{hashlib.sha256(data).hexdigest()[:16]}-{uuid.uuid4().hex[:12]}.pdf"
+    path.write_bytes(data)
+    return path
+
+
+def render_job(runner: "JobRunner", job_id: str) -> None:
+    job = runner.get(job_id)
+    if job is None:
+        st.warning(f"Job {job_id} not found.")
+        return
+
+    events = runner.events(job_id)
+    extracted = sum(
+        1
+        for event in events
+        if event["kind"] == "task_completed" and (event.get("task") or "").startswith("extract_")
+    )
+    draft = "".join(
+        event.get("text") or ""
+        for event in events
+        if event["kind"] == "token" and event.get("task") == "summarize"
+    )
+    st.caption(f"Job {job_id} · {job['status']} · {extracted} chunks extracted")
+
+    if job["status"] == "failed":
+        st.error(f"Summarization failed: {job['error']}")
+        return
+    if job["status"] != "done":
+        if draft:
+            st.text(draft)
+        time.sleep(get_settings().job_poll_seconds)
+        st.rerun()
+
+    st.success("Complete")
+    summary = parse_output(job["result"] or "", DocumentSummary)
+    if summary is None:
+        st.subheader("Summary")
+        st.write(job["result"] or "(No summary text returned)")
+        return
+    st.subheader(summary.title or "Summary")
+    st.write(summary.summary)
+    if summary.key_points:
+        st.markdown("**Key points**\n\n" + "\n".join(f"- {point}" for point in summary.key_points))
 
+
+def main() -> None:
     st.set_page_config(page_title="PDF Summarizer MAS", layout="wide")
+    try:
+        get_settings()
+    except SettingsError as exc:
+        st.error(f"Invalid configuration: {exc}")
+        st.stop()
+
     st.title("PDF Summarizer (Mini MAS)")
-    st.caption("Two-agent workflow: Extractor → Summarizer")
+    st.caption("Map-reduce workflow: parallel Extractors per chunk → Summarizer")
 
     input_mode = st.radio("Input type", ["PDF", "Text"], horizontal=True)
 
@@ -34,102 +103,35 @@ def main() -> None:
             placeholder="Paste or type text to summarize...",
         )
 
+    ready = True
     if input_mode == "PDF" and uploaded is None:
         st.info("Upload a PDF to begin.")
-        return
+        ready = False
 
     if input_mode == "Text" and not text_input.strip():
         st.info("Enter some text to begin.")
-        return
+        ready = False
 
-    run = st.button("Summarize", type="primary")
+    run = st.button("Summarize", type="primary", disabled=not ready)
+    runner = get_job_runner()
 
     if run:
-        output = io.StringIO()
-        status = st.empty()
-        progress = st.progress(0)
-
-        if input_mode == "PDF":
-            status.info("Reading PDF...")
-            progress.progress(10)
-            with st.spinner("Reading PDF..."):
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-                    tmp.write(uploaded.read())
-                    tmp_path = Path(tmp.name)
-
-                try:
-                    doc_text = read_pdf_text(tmp_path)
-                finally:
-                    os.unlink(tmp_path)
-        else:
-            status.info("Preparing text...")
-            progress.progress(10)
-            doc_text = text_input.strip()
-
-        max_chars = int(os.getenv("PDF_MAX_CHARS", "12000"))
-        if len(doc_text) > max_chars:
-            st.warning(
-                f"PDF text is long ({len(doc_text):,} chars). "
-                f"Truncating to {max_chars:,} chars to avoid long LLM calls."
-            )
-            doc_text = doc_text[:max_chars]
-
-        has_google = bool(os.getenv("GOOGLE_API_KEY") or os.getenv("GEMINI_API_KEY"))
-        has_openai = bool(os.getenv("OPENAI_API_KEY"))
-        if not (has_google or has_openai):
+        settings = get_settings()
+        if not (settings.google_key or settings.openai_api_key):
             st.error(
                 "No LLM configured. Set GOOGLE_API_KEY or GEMINI_API_KEY, or OPENAI_API_KEY in .env."
             )
             return
 
-        status.info("Running crew...")
-        progress.progress(50)
-        with st.spinner("Running crew..."):
-            try:
-                crew = build_pdf_crew(doc_text)
-                with redirect_stdout(output):
-                    result = crew.kickoff()
-            except Exception as exc:
-                status.error("Failed")
-                st.error(f"Summarization failed: {exc}")
-                return
-        progress.progress(100)
-        status.success("Complete")
-        st.success("Complete")
-        st.subheader("Summary")
+        if input_mode == "PDF":
+            payload = {"pdf_path": str(save_upload(uploaded.getvalue())), "cleanup": True}
+        else:
+            payload = {"text": text_input.strip()}
+        st.query_params["job"] = runner.submit(PDF_HANDLER, payload)
 
-        def extract_summary(value) -> str:
-            if value is None:
-                return ""
-            if isinstance(value, str):
-                return value.strip()
-            if isinstance(value, dict):
-                if isinstance(value.get("raw"), str):
-                    return value["raw"].strip()
-                tasks = value.get("tasks_output") or []
-                if tasks:
-                    last = tasks[-1]
-                    if isinstance(last, dict) and isinstance(last.get("raw"), str):
-                        return last["raw"].strip()
-            raw = getattr(value, "raw", None)
-            if isinstance(raw, str):
-                return raw.strip()
-            tasks = getattr(value, "tasks_output", None)
-            if tasks:
-                last = tasks[-1]
-                last_raw = getattr(last, "raw", None)
-                if isinstance(last_raw, str):
-                    return last_raw.strip()
-            return str(value).strip()
-
-        summary_text = extract_summary(result)
-        st.write(summary_text if summary_text else "(No summary text returned)")
-
-        with st.expander("Raw output"):
-            st.write(result)
-
-        with st.expander("Agent Internal Reasoning (verbose logs)"):
-            st.text(output.getvalue())
+    job_id = st.query_params.get("job")
+    if job_id:
+        render_job(runner, job_id)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,22 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+for path in (ROOT / "src", ROOT / "src2"):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+os.environ["ENV_FILE"] = ""
+
+from crew import settings
+
+
+@pytest.fixture(autouse=True)
+def fresh_settings():
+    yield
+    for key in settings._overrides:
+        os.environ.pop(key, None)
+    settings._overrides.clear()
+    settings._settings = None
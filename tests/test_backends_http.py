@@ -0,0 +1,68 @@
+import asyncio
+import threading
+
+import pytest
+
+pytest.importorskip("httpx")
+
+from crew.backends import http
+from crew.backends.stub_server import start_stub_server
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    def start(latency: float = 0.0, timeout: str | None = None):
+        server, url = start_stub_server(latency=latency)
+        monkeypatch.setenv("TOOL_BACKEND_METRICS_URL", url)
+        if timeout is not None:
+            monkeypatch.setenv("TOOL_BACKEND_METRICS_TIMEOUT", timeout)
+        servers.append(server)
+        return http.backend_for("metrics")
+
+    servers = []
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+def test_identical_gets_are_coalesced(stub):
+    backend = stub(latency=0.3)
+
+    async def burst():
+        calls = [http.call_backend("metrics", "checkout 5xx", "fallback") for _ in range(5)]
+        return await asyncio.gather(*calls)
+
+    results = http.run_backend(burst())
+    assert all(result.startswith("metrics: error_rate=4.8%") for result in results)
+    assert backend.stats == {"requests": 1, "coalesced": 4, "errors": 0}
+
+
+def test_callers_on_other_event_loops_share_a_request(stub):
+    backend = stub(latency=0.3)
+    results = []
+
+    def caller():
+        results.append(asyncio.run(http.call_backend("metrics", "same", "fallback")))
+
+    threads = [threading.Thread(target=caller) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 3
+    assert all(result.startswith("metrics: error_rate=4.8%") for result in results)
+    assert backend.stats["requests"] == 1
+    assert backend.stats["errors"] == 0
+
+
+def test_slow_backend_times_out_to_fallback(stub):
+    backend = stub(latency=0.5, timeout="0.1")
+    result = http.run_backend(http.call_backend("metrics", "slow", "fallback"))
+    assert result == "metrics backend unavailable (ReadTimeout); fallback"
+    assert backend.stats["errors"] == 1
+
+
+def test_invalid_timeout_falls_back_to_default(stub):
+    with pytest.warns(RuntimeWarning, match="TOOL_BACKEND_METRICS_TIMEOUT"):
+        backend = stub(timeout="soon")
+    assert backend.timeout == 5.0
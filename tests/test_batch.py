@@ -0,0 +1,76 @@
+import io
+import json
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+from crew.batch import BatchRunner, load_checkpoint, parse_incidents
+from crew.settings import override_settings
+
+
+def test_parse_incidents_accepts_text_objects_and_other_json():
+    lines = [
+        "db-1 latency spike",
+        "",
+        '{"id": "inc-7", "incident": "checkout errors"}',
+        '{"description": "queue backlog"}',
+        '{"id": "inc-8"}',
+        "[1, 2]",
+        "42",
+        "null",
+        '"quoted text"',
+    ]
+    records = list(parse_incidents(lines))
+    assert [record["incident"] for record in records] == [
+        "db-1 latency spike",
+        "checkout errors",
+        "queue backlog",
+        "[1, 2]",
+        "42",
+        "null",
+        "quoted text",
+    ]
+    assert records[1]["id"] == "inc-7"
+    assert records[0]["id"] == next(parse_incidents(["db-1 latency spike"]))["id"]
+
+
+def test_load_checkpoint_skips_malformed_lines(tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    assert load_checkpoint(path) == set()
+    path.write_text('{"id": "a"}\nnot json\n[1]\n7\n{"other": 1}\n{"id": "b"}\n', encoding="utf-8")
+    assert load_checkpoint(path) == {"a", "b"}
+
+
+class RecordingFactory:
+    def __init__(self, failing=()):
+        self.seen = []
+        self.failing = set(failing)
+
+    @contextmanager
+    def crew(self, incident):
+        self.seen.append(incident)
+        if incident in self.failing:
+            raise RuntimeError("provider down")
+        usage = SimpleNamespace(total_tokens=10)
+        yield SimpleNamespace(
+            kickoff=lambda: SimpleNamespace(raw=f"done {incident}", token_usage=usage)
+        )
+
+
+def test_rerun_resumes_after_checkpointed_incidents(tmp_path):
+    override_settings(TRACING="false")
+    checkpoint = tmp_path / "batch.checkpoint.jsonl"
+    records = list(parse_incidents(["first", "second", "third"]))
+
+    first = RecordingFactory(failing={"second"})
+    output = io.StringIO()
+    stats = BatchRunner(output, checkpoint, 2, factory=first).run(records)
+    assert (stats["completed"], stats["failed"], stats["skipped"]) == (2, 1, 0)
+    assert load_checkpoint(checkpoint) == {records[0]["id"], records[2]["id"]}
+    outcomes = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert sorted(outcome["status"] for outcome in outcomes) == ["error", "ok", "ok"]
+
+    second = RecordingFactory()
+    stats = BatchRunner(io.StringIO(), checkpoint, 2, factory=second).run(records)
+    assert second.seen == ["second"]
+    assert (stats["completed"], stats["skipped"], stats["tokens"]) == (1, 2, 10)
+    assert len(load_checkpoint(checkpoint)) == 3
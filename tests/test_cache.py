@@ -0,0 +1,42 @@
+import pytest
+
+from crew import cache
+from crew.cache import ResponseCache, cache_key
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    return now
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    store = ResponseCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=60)
+    store.put("a", "model", "first")
+    clock[0] += 59
+    assert store.get("a") == "first"
+    clock[0] += 2
+    assert store.get("a") is None
+    assert store.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5, "entries": 0}
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path, clock):
+    store = ResponseCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    store.put("a", "model", "first")
+    clock[0] += 1
+    store.put("b", "model", "second")
+    clock[0] += 1
+    assert store.get("a") == "first"
+    clock[0] += 1
+    store.put("c", "model", "third")
+    assert store.get("b") is None
+    assert (store.get("a"), store.get("c")) == ("first", "third")
+    assert store.stats()["entries"] == 2
+
+
+def test_cache_key_ignores_whitespace_and_unrelated_params():
+    messages = [{"role": "user", "content": "Check db-1  \r\nlatency "}]
+    key = cache_key("gpt", messages, {"temperature": 0, "api_key": "secret"})
+    assert key == cache_key("gpt", [{"content": "Check db-1\nlatency"}], {"temperature": 0})
+    assert key != cache_key("gpt", messages, {"temperature": 0.5})
@@ -0,0 +1,31 @@
+from crew.context import IncidentContext, select_within_budget
+from crew.ratelimit import estimate_tokens
+from crew.settings import override_settings
+
+
+def test_single_long_line_is_clipped_not_dropped():
+    override_settings(CONTEXT_VIEW_TOKENS="400")
+    incident = "Payments API returns 500s after deploy " + "with upstream timeouts " * 100
+    context = IncidentContext(incident)
+    for role in ("sre_triage", "database_specialist", "comms_lead"):
+        view = context.view(role)
+        assert view.startswith("Payments API returns 500s after deploy")
+        assert "omitted" not in view
+        assert view.endswith("...")
+
+
+def test_view_stays_within_role_budget():
+    override_settings(CONTEXT_VIEW_TOKENS="400")
+    lines = ["Checkout is down for all users."]
+    lines += [f"db pool exhausted on replica {name} " + name * 60 for name in "abcdefghij"]
+    view = IncidentContext("\n".join(lines)).view("comms_lead")
+    assert view.startswith("Checkout is down")
+    assert "less relevant lines omitted" in view
+    assert estimate_tokens(view) <= 240
+
+
+def test_select_within_budget_prefers_priority_items():
+    items = ["a" * 40, "b" * 40, "c" * 40]
+    chosen = select_within_budget(items, [False, True, False], 20)
+    assert list(chosen) == [0, 1]
+    assert chosen[1] == items[1]
@@ -0,0 +1,21 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "bench"))
+
+import import_budget
+
+
+@pytest.mark.parametrize("module", sorted(import_budget.BUDGETS_MS))
+def test_entry_point_defers_heavy_modules(module):
+    report, _ = import_budget.check_budget(module)
+    assert not report["heavy"]
+
+
+@pytest.mark.parametrize("module", import_budget.UI_MODULES)
+def test_ui_defers_crew_stack(module):
+    pytest.importorskip("streamlit")
+    _, failures = import_budget.check_ui(module)
+    assert not failures
@@ -0,0 +1,77 @@
+from crew.backends.logs import LogIndex
+from crew.settings import override_settings
+
+TRACE = [
+    "2024-05-01T10:00:{second:02d} ERROR payments request {n} failed",
+    *[f"    at com.example.payments.Client.call{i}(Client.java:{i})" for i in range(12)],
+    "Caused by: java.net.ConnectException: connection refused",
+]
+
+
+def write_events(path, seconds, mode="w"):
+    with open(path, mode, encoding="utf-8") as f:
+        for second in seconds:
+            f.write(f"2024-05-01T10:00:{second:02d} INFO heartbeat ok\n")
+            for line in TRACE:
+                f.write(line.format(second=second, n=second) + "\n")
+
+
+def build_index(tmp_path, block_bytes=256):
+    override_settings(LOG_INDEX_BLOCK=str(block_bytes), LOG_INDEX_BLOOM_BITS="1000")
+    logs = tmp_path / "logs"
+    logs.mkdir(exist_ok=True)
+    return logs, LogIndex(logs, index_dir=tmp_path / "index")
+
+
+def test_event_crossing_block_boundary_keeps_its_cause(tmp_path):
+    logs, index = build_index(tmp_path)
+    write_events(logs / "app.log", [1, 2, 3])
+    result = index.search("payments last 60 minutes")
+    assert result["blocks"] > 3
+    assert [entry["count"] for entry in result["signatures"]] == [3]
+    assert "java.net.ConnectException" in result["signatures"][0]["signature"]
+
+
+def test_keyword_only_in_continuation_block_finds_the_event(tmp_path):
+    logs, index = build_index(tmp_path)
+    write_events(logs / "app.log", [1])
+    result = index.search("connectexception last 60 minutes")
+    assert result["keywords"] == ["connectexception"]
+    assert result["total"] == 1
+    assert "java.net.ConnectException" in result["signatures"][0]["signature"]
+
+
+def test_incremental_update_appends_blocks(tmp_path):
+    logs, index = build_index(tmp_path)
+    path = logs / "app.log"
+    write_events(path, [1])
+    files = index.refresh()
+    before = files[0].blocks.copy()
+    write_events(path, [2, 3], mode="a")
+    files = index.refresh()
+    after = files[0].blocks
+    assert len(after) > len(before)
+    assert (after[: len(before)] == before).all()
+    assert int(after[-1, 1]) == path.stat().st_size
+    assert index.search("payments last 60 minutes")["total"] == 3
+
+
+def test_continuation_written_after_indexing_joins_its_event(tmp_path):
+    logs, index = build_index(tmp_path, block_bytes=4096)
+    path = logs / "app.log"
+    path.write_text("2024-05-01T10:00:01 ERROR payments request failed\n", encoding="utf-8")
+    index.refresh()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write("Caused by: java.net.ConnectException: refused\n")
+    result = index.search("connectexception last 60 minutes")
+    assert result["total"] == 1
+    assert "java.net.ConnectException" in result["signatures"][0]["signature"]
+
+
+def test_rewritten_file_is_reindexed(tmp_path):
+    logs, index = build_index(tmp_path)
+    path = logs / "app.log"
+    write_events(path, [1, 2])
+    index.refresh()
+    write_events(path, [5])
+    assert index.search("payments last 60 minutes")["total"] == 1
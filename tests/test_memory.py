@@ -0,0 +1,34 @@
+import pytest
+
+from crew.memory import LocalMemoryStorage
+from crew.settings import override_settings
+
+
+def fill(storage: LocalMemoryStorage, count: int) -> None:
+    for i in range(count):
+        storage.save(f"payments api returned 500 errors after deploy {i}")
+    storage.flush()
+
+
+def test_memory_knobs_come_from_settings(tmp_path):
+    override_settings(MEMORY_EMBED_DIM="64", MEMORY_BATCH_SIZE="4", MEMORY_MIN_SCORE="0.2")
+    storage = LocalMemoryStorage(tmp_path)
+    assert storage.embedder.dim == 64
+    assert storage.batch_size == 4
+    assert storage.min_score == 0.2
+
+
+def test_caller_threshold_is_not_lowered(tmp_path):
+    storage = LocalMemoryStorage(tmp_path)
+    fill(storage, 3)
+    assert storage.search("payments api errors", limit=3)
+    assert storage.search("payments api errors", limit=3, score_threshold=0.99) == []
+
+
+def test_scan_limit_truncation_warns(tmp_path):
+    override_settings(MEMORY_SCAN_LIMIT="2")
+    storage = LocalMemoryStorage(tmp_path)
+    fill(storage, 5)
+    with pytest.warns(RuntimeWarning, match="MEMORY_SCAN_LIMIT"):
+        results = storage.search("payments api errors", limit=5)
+    assert {result["id"] for result in results} <= {3, 4}
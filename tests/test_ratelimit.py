@@ -0,0 +1,75 @@
+import threading
+import time
+
+import pytest
+
+from crew.ratelimit import RateGovernor, is_rate_limit_error
+
+
+class StatusError(Exception):
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+@pytest.mark.parametrize(
+    "exc",
+    [
+        StatusError("slow down", 429),
+        RuntimeError("litellm.RateLimitError: 429 Too Many Requests"),
+        RuntimeError("HTTP/1.1 429"),
+        RuntimeError("error code=429"),
+        RuntimeError("RESOURCE_EXHAUSTED: quota exceeded"),
+        RuntimeError("rate limit reached for gemini-flash"),
+    ],
+)
+def test_rate_limit_errors_are_detected(exc):
+    assert is_rate_limit_error(exc)
+
+
+@pytest.mark.parametrize(
+    "exc",
+    [
+        StatusError("server error", 500),
+        RuntimeError("request 4290 failed"),
+        RuntimeError("trace id a1429b not found"),
+        RuntimeError("took 1.429s before connection reset"),
+    ],
+)
+def test_other_errors_are_not_rate_limits(exc):
+    assert not is_rate_limit_error(exc)
+
+
+def wait_for_waiters(governor, count):
+    deadline = time.monotonic() + 5
+    while len(governor._waiters) < count:
+        assert time.monotonic() < deadline
+        time.sleep(0.005)
+
+
+def test_synthesis_lane_acquires_before_earlier_specialist():
+    governor = RateGovernor(rpm=600)
+    governor.requests.level = 0.0
+    order = []
+
+    def acquire(lane):
+        governor.acquire(lane=lane)
+        order.append(lane)
+
+    threads = []
+    for count, lane in enumerate(("specialist", "synthesis"), start=1):
+        thread = threading.Thread(target=acquire, args=(lane,))
+        thread.start()
+        threads.append(thread)
+        wait_for_waiters(governor, count)
+    for thread in threads:
+        thread.join(timeout=5)
+    assert order == ["synthesis", "specialist"]
+    assert governor.stats["acquired"] == 2
+
+
+def test_penalize_blocks_every_lane():
+    governor = RateGovernor()
+    governor.penalize(0.2)
+    assert governor.acquire(lane="synthesis") >= 0.15
+    assert governor.stats["rate_limited"] == 1
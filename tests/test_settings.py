@@ -0,0 +1,36 @@
+import pytest
+
+from crew.settings import Settings, SettingsError
+
+
+def test_valid_values_are_parsed():
+    settings = Settings.from_env(
+        {"ADAPTIVE_CONFIDENCE": "0.8", "LLM_CACHE_TTL": "60", "SAFE_MODE": "yes"}
+    )
+    assert settings.adaptive_confidence == 0.8
+    assert settings.llm_cache_ttl == 60.0
+    assert settings.safe_mode is True
+
+
+@pytest.mark.parametrize(
+    "name, raw, message",
+    [
+        ("ADAPTIVE_CONFIDENCE", "7", "at most 1.0"),
+        ("INCIDENT_KNOWN_SCORE", "-0.1", "at least 0.0"),
+        ("LLM_CACHE_TTL", "nan", "finite"),
+        ("LLM_CACHE_TTL", "inf", "finite"),
+        ("CREW_POOL_SIZE", "0", "at least 1"),
+        ("AGENT_MAX_RPM", "ten", "not a valid int"),
+        ("SAFE_MODE", "maybe", "not a valid bool"),
+    ],
+)
+def test_out_of_range_values_are_rejected(name, raw, message):
+    with pytest.raises(SettingsError, match=message):
+        Settings.from_env({name: raw})
+
+
+def test_all_errors_are_reported_together():
+    with pytest.raises(SettingsError) as excinfo:
+        Settings.from_env({"ADAPTIVE_CONFIDENCE": "7", "LLM_CACHE_TTL": "nan"})
+    assert "ADAPTIVE_CONFIDENCE" in str(excinfo.value)
+    assert "LLM_CACHE_TTL" in str(excinfo.value)
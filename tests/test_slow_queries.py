@@ -0,0 +1,91 @@
+from crew.backends.slow_queries import SlowLogParser, SlowQueryDigest, fingerprint
+from crew.settings import override_settings
+
+
+def pg_line(ms, sql, db="shop"):
+    return f"2024-05-01 10:00:00 UTC [42] db={db} LOG:  duration: {ms} ms  statement: {sql}\n"
+
+
+def test_fingerprint_normalizes_literals_lists_and_comments():
+    assert fingerprint("SELECT * FROM users WHERE id = 42 AND name = 'o''brien';") == (
+        "select * from users where id = ? and name = ?"
+    )
+    assert fingerprint("select * from t where id in (1, 2, 3)") == fingerprint(
+        "SELECT * FROM t WHERE id IN (7)"
+    )
+    assert fingerprint("insert into t values (1, 'a'), (2, 'b'), (3, 'c')") == (
+        "insert into t values (?+)"
+    )
+    assert fingerprint("/* app:web */ select 1.5e3, 0xff -- trailing\nfrom dual") == (
+        "select ?, ? from dual"
+    )
+    assert fingerprint("select * from t2 where c1 = $1") == "select * from t2 where c1 = ?"
+
+
+def test_parser_joins_postgres_continuation_lines():
+    parser = SlowLogParser()
+    assert parser.feed(pg_line(12.5, "select *").rstrip("\n"), 0) is None
+    assert parser.feed("    from orders", 80) is None
+    assert parser.pending_offset() == 0
+    entry = parser.feed(pg_line(3, "select 1").rstrip("\n"), 100)
+    assert entry["sql"] == "select * from orders"
+    assert (entry["ms"], entry["db"], entry["offset"]) == (12.5, "shop", 0)
+
+
+def test_digest_resumes_from_offset_without_double_counting(tmp_path):
+    log = tmp_path / "postgres.log"
+    log.write_text(pg_line(10, "select * from orders where id = 1"), encoding="utf-8")
+    digest = SlowQueryDigest(str(log), directory=tmp_path / "state")
+    assert digest.ingest() == (1, 0)
+
+    with open(log, "a", encoding="utf-8") as f:
+        f.write(pg_line(30, "select * from orders where id = 2"))
+        f.write("2024-05-01 10:00:01 UTC [42] db=shop LOG:  duration: 5 ms  statement: upd")
+    added, pending = digest.ingest()
+    assert added == 0
+    assert pending > 0
+
+    with open(log, "a", encoding="utf-8") as f:
+        f.write("ate stock set n = n - 1\n")
+    resumed = SlowQueryDigest(str(log), directory=tmp_path / "state")
+    assert resumed.ingest() == (2, 0)
+    counts = {entry["fingerprint"]: entry["count"] for entry in resumed.top_queries()}
+    assert counts == {
+        "select * from orders where id = ?": 2,
+        "update stock set n = n - ?": 1,
+    }
+
+
+def test_mysql_entry_split_across_reads_is_counted_once(tmp_path):
+    log = tmp_path / "mysql-slow.log"
+    header = (
+        "# Time: 2024-05-01T10:00:00.000000Z\n"
+        "# User@Host: app[app] @ localhost []\n"
+        "# Query_time: 1.500000  Lock_time: 0.000100 Rows_sent: 1  Rows_examined: 900\n"
+        "use shop;\n"
+    )
+    log.write_text(header + "SELECT * FROM orders\n", encoding="utf-8")
+    digest = SlowQueryDigest(str(log), directory=tmp_path / "state")
+    added, pending = digest.ingest()
+    assert added == 0
+    assert pending > 0
+
+    with open(log, "a", encoding="utf-8") as f:
+        f.write("WHERE id = 5;\n")
+    assert digest.ingest() == (1, 0)
+    [entry] = digest.top_queries()
+    assert entry["fingerprint"] == "select * from orders where id = ?"
+    assert (entry["db"], entry["max_ms"], entry["rows_examined"]) == ("shop", 1500.0, 900.0)
+
+
+def test_byte_budget_spreads_ingest_over_calls(tmp_path):
+    override_settings(SLOW_QUERY_MAX_BYTES="200")
+    log = tmp_path / "postgres.log"
+    log.write_text("".join(pg_line(n, f"select {n}") for n in range(1, 11)), encoding="utf-8")
+    digest = SlowQueryDigest(str(log), directory=tmp_path / "state")
+    added, pending = digest.ingest()
+    assert 0 < added < 10
+    assert pending > 0
+    while pending:
+        added, pending = digest.ingest()
+    assert digest.top_queries()[0]["count"] == 10
@@ -0,0 +1,49 @@
+import warnings
+
+import numpy as np
+
+from crew.backends.timeseries import parse_times, score_frame
+
+
+def test_parse_times_converts_offsets_to_utc():
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        times = parse_times(
+            [
+                "2024-05-01T10:00:00Z",
+                "2024-05-01T12:00:00+02:00",
+                "2024-05-01T05:00:00-05:00",
+                "2024-05-01 10:00:00",
+            ]
+        )
+    assert len(set(times.tolist())) == 1
+    assert times[0] == 1714557600
+
+
+def test_parse_times_accepts_epoch_seconds():
+    assert parse_times(["1714557600", "1714557660.0"]).tolist() == [1714557600, 1714557660]
+    assert parse_times(["1714557600"]).dtype == np.int64
+
+
+def seeded_frame(anomalies, onset=-8, series=200, points=120):
+    rng = np.random.default_rng(7)
+    values = 100.0 + rng.standard_normal((series, points))
+    for row, jump in anomalies.items():
+        values[row, onset:] += jump
+    return values.astype(np.float32)
+
+
+def test_score_frame_ranks_seeded_shifts_first():
+    values = seeded_frame({3: 8.0, 42: 10.0, 150: -12.0})
+    result = score_frame(values, 12, np.zeros(len(values), dtype=bool), 48)
+    top = set(np.argsort(-result["score"])[:3].tolist())
+    assert top == {3, 42, 150}
+    assert (result["score"][[3, 42, 150]] >= 4.0).all()
+    assert np.delete(result["score"], [3, 42, 150]).max() < 4.0
+    assert abs(int(result["onset"][42]) + 8) <= 2
+
+
+def test_score_frame_ignores_improvement_on_higher_is_worse_metric():
+    values = seeded_frame({5: -10.0})
+    result = score_frame(values, 12, np.ones(len(values), dtype=bool), 48)
+    assert result["score"][5] == 0.0